@@ -0,0 +1,167 @@
+from random import Random
+from struct import pack, unpack
+from typing import Callable, Dict, List
+
+from nbt.classes import *
+
+ITEM_IDS = [
+    "minecraft:stone", "minecraft:diamond_sword", "minecraft:oak_planks", "minecraft:torch",
+    "minecraft:enchanted_book", "minecraft:written_book", "minecraft:iron_pickaxe", "minecraft:bread"
+]
+ENTITY_IDS = [
+    "minecraft:zombie", "minecraft:skeleton", "minecraft:item", "minecraft:villager",
+    "minecraft:cow", "minecraft:armor_stand", "minecraft:item_frame", "minecraft:creeper"
+]
+WORDS = [
+    "lorem", "ipsum", "dolor", "sit", "amet", "café", "naïve", "日本", "☃", "blocks",
+    "of", "the", "overworld", "nether", "end", "\U0001f525"
+]
+
+
+def _text(rng: Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _float32(value: float) -> float:
+    return unpack("!f", pack("!f", value))[0]
+
+
+def _doubles(rng: Random, count: int) -> NBTTagList:
+    return NBTTagList(NBTTagDouble(rng.uniform(-3.0e7, 3.0e7)) for _ in range(count))
+
+
+def _floats(rng: Random, count: int) -> NBTTagList:
+    return NBTTagList(NBTTagFloat(_float32(rng.uniform(-180.0, 180.0))) for _ in range(count))
+
+
+def _item(rng: Random) -> NBTTagCompound:
+    item = NBTTagCompound()
+    item["id"] = NBTTagString(rng.choice(ITEM_IDS))
+    item["Count"] = NBTTagByte(rng.randint(1, 64))
+    item["Slot"] = NBTTagByte(rng.randint(0, 35))
+
+    tag = NBTTagCompound()
+    display = NBTTagCompound()
+    display["Name"] = NBTTagString('{"text":"' + _text(rng, 3) + '"}')
+    display["Lore"] = NBTTagList(NBTTagString('{"text":"' + _text(rng, 8) + '"}') for _ in range(rng.randint(1, 6)))
+    tag["display"] = display
+    tag["pages"] = NBTTagList(NBTTagString(_text(rng, rng.randint(20, 80))) for _ in range(rng.randint(0, 4)))
+    enchantments = NBTTagList()
+    for _ in range(rng.randint(0, 4)):
+        enchantment = NBTTagCompound()
+        enchantment["id"] = NBTTagString("minecraft:" + rng.choice(WORDS))
+        enchantment["lvl"] = NBTTagShort(rng.randint(1, 5))
+        enchantments.append(enchantment)
+    tag["Enchantments"] = enchantments
+    item["tag"] = tag
+    return item
+
+
+def _entity(rng: Random) -> NBTTagCompound:
+    entity = NBTTagCompound()
+    entity["id"] = NBTTagString(rng.choice(ENTITY_IDS))
+    entity["Pos"] = _doubles(rng, 3)
+    entity["Motion"] = _doubles(rng, 3)
+    entity["Rotation"] = _floats(rng, 2)
+    entity["UUID"] = NBTTagIntArray(rng.getrandbits(32) - 2 ** 31 for _ in range(4))
+    entity["Health"] = NBTTagFloat(_float32(rng.uniform(0.0, 20.0)))
+    entity["Fire"] = NBTTagShort(rng.randint(-20, 0))
+    entity["Air"] = NBTTagShort(300)
+    entity["OnGround"] = NBTTagByte(rng.randint(0, 1))
+    entity["Invulnerable"] = NBTTagByte(0)
+    entity["PortalCooldown"] = NBTTagInt(0)
+    entity["ArmorItems"] = NBTTagList(_item(rng) for _ in range(4))
+    entity["HandItems"] = NBTTagList(_item(rng) for _ in range(2))
+    return entity
+
+
+def chunk(rng: Random, scale: int) -> NBTTagCompound:
+    level = NBTTagCompound()
+    level["xPos"] = NBTTagInt(rng.randint(-1000, 1000))
+    level["zPos"] = NBTTagInt(rng.randint(-1000, 1000))
+    level["LastUpdate"] = NBTTagLong(rng.getrandbits(40))
+    level["InhabitedTime"] = NBTTagLong(rng.getrandbits(24))
+    level["Status"] = NBTTagString("full")
+    level["Biomes"] = NBTTagIntArray(rng.randint(0, 80) for _ in range(1024))
+
+    heightmaps = NBTTagCompound()
+    for name in ("MOTION_BLOCKING", "OCEAN_FLOOR", "WORLD_SURFACE"):
+        heightmaps[name] = NBTTagLongArray(rng.getrandbits(64) - 2 ** 63 for _ in range(37))
+    level["Heightmaps"] = heightmaps
+
+    sections = NBTTagList()
+    for y in range(16 * scale):
+        section = NBTTagCompound()
+        section["Y"] = NBTTagByte(y % 128)
+        section["BlockLight"] = NBTTagByteArray(rng.getrandbits(8) for _ in range(2048))
+        section["SkyLight"] = NBTTagByteArray(rng.getrandbits(8) for _ in range(2048))
+        section["BlockStates"] = NBTTagLongArray(rng.getrandbits(64) - 2 ** 63 for _ in range(256))
+        palette = NBTTagList()
+        for _ in range(rng.randint(4, 16)):
+            state = NBTTagCompound()
+            state["Name"] = NBTTagString(rng.choice(ITEM_IDS))
+            palette.append(state)
+        section["Palette"] = palette
+        sections.append(section)
+    level["Sections"] = sections
+
+    tile_entities = NBTTagList()
+    for _ in range(4 * scale):
+        tile = NBTTagCompound()
+        tile["id"] = NBTTagString(rng.choice(["minecraft:chest", "minecraft:mob_spawner", "minecraft:furnace"]))
+        tile["x"] = NBTTagInt(rng.randint(0, 15))
+        tile["y"] = NBTTagInt(rng.randint(0, 255))
+        tile["z"] = NBTTagInt(rng.randint(0, 15))
+        tile["Items"] = NBTTagList(_item(rng) for _ in range(rng.randint(0, 8)))
+        tile_entities.append(tile)
+    level["TileEntities"] = tile_entities
+
+    root = NBTTagCompound()
+    root["DataVersion"] = NBTTagInt(2586)
+    root["Level"] = level
+    return root
+
+
+def entities(rng: Random, scale: int) -> NBTTagCompound:
+    root = NBTTagCompound()
+    root["DataVersion"] = NBTTagInt(2586)
+    root["Entities"] = NBTTagList(_entity(rng) for _ in range(64 * scale))
+    return root
+
+
+def items(rng: Random, scale: int) -> NBTTagCompound:
+    root = NBTTagCompound()
+    root["Inventory"] = NBTTagList(_item(rng) for _ in range(128 * scale))
+    root["EnderItems"] = NBTTagList(_item(rng) for _ in range(27 * scale))
+    return root
+
+
+def nested(rng: Random, scale: int) -> NBTTagCompound:
+    root = NBTTagCompound()
+    for branch in range(8 * scale):
+        node = root
+        for depth in range(rng.randint(16, 96)):
+            child = NBTTagCompound()
+            child["depth"] = NBTTagInt(depth)
+            child["name"] = NBTTagString(_text(rng, 2))
+            if rng.random() < 0.25:
+                child["siblings"] = NBTTagList(NBTTagList(NBTTagShort(rng.randint(0, 9)) for _ in range(3))
+                                              for _ in range(2))
+            node["b" + str(branch) if node is root else "child"] = child
+            node = child
+    return root
+
+
+GENERATORS: Dict[str, Callable[[Random, int], NBTTagCompound]] = {
+    "chunk": chunk,
+    "entities": entities,
+    "items": items,
+    "nested": nested
+}
+
+
+def generate(seed: int = 0, scale: int = 1, names: List[str] = None) -> Dict[str, NBTTagCompound]:
+    corpus: Dict[str, NBTTagCompound] = {}
+    for name in names or GENERATORS:
+        corpus[name] = GENERATORS[name](Random(str(seed) + ":" + name), scale)
+    return corpus
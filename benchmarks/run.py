@@ -0,0 +1,227 @@
+"""
+Run with ``python -m benchmarks.run``. Save a baseline with ``--save baseline.json`` and compare a later run
+against it with ``--baseline baseline.json``; the exit status is non-zero when a benchmark regressed.
+"""
+import argparse
+import gzip
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import nbt
+from nbt.classes import *
+from nbt.json import NBTReader, from_json, to_json
+
+from benchmarks import corpus
+
+
+class Case:
+
+    def __init__(self, name: str, tag: NBTTagCompound, directory: str):
+        self.name: str = name
+        self.tag: NBTTagCompound = tag
+
+        stream = io.BytesIO()
+        tag.write_out(stream)
+        self.raw: bytes = stream.getvalue()
+        self.snbt: str = str(tag)
+        self.json: str = to_json(tag)
+        self.tags: int = count_tags(tag)
+
+        self.path: str = os.path.join(directory, name + ".nbt")
+        with open(self.path, 'wb') as out:
+            out.write(self.raw)
+        self.zipped_path: str = os.path.join(directory, name + ".nbt.gz")
+        with gzip.open(self.zipped_path, 'wb') as out:
+            out.write(self.raw)
+
+
+def count_tags(tag: NBTBase) -> int:
+    count = 0
+    pending: List[NBTBase] = [tag]
+    while pending:
+        current = pending.pop()
+        count += 1
+        if isinstance(current, NBTTagCompound):
+            pending.extend(current.values())
+        elif isinstance(current, NBTTagList):
+            pending.extend(current)
+    return count
+
+
+def _write_out(case: Case) -> None:
+    case.tag.write_out(io.BytesIO())
+
+
+def _digest_cached(case: Case) -> Callable[[], object]:
+    # Hash once while setting up, so every timed call is a cache hit even with --repeat 1
+    case.tag.digest()
+    return case.tag.digest
+
+
+def build(tag: NBTBase) -> NBTBase:
+    # Rebuilds the tree through item assignment and append, the path user code takes through the tracked mutators
+    if isinstance(tag, NBTTagCompound):
+        compound = NBTTagCompound()
+        for (key, value) in tag.items():
+            compound[key] = build(value)
+        return compound
+    elif isinstance(tag, NBTTagList):
+        tags = NBTTagList()
+        for value in tag:
+            tags.append(build(value))
+        return tags
+    return tag
+
+
+def naive_json(tag: NBTBase):
+    if isinstance(tag, NBTTagCompound):
+        return {key: naive_json(value) for (key, value) in tag.items()}
+    elif isinstance(tag, NBTTagList):
+        return [naive_json(value) for value in tag]
+    elif isinstance(tag, (NBTTagByteArray, NBTTagIntArray, NBTTagLongArray)):
+        return list(tag)
+    elif isinstance(tag, str):
+        return str.__str__(tag)
+    elif isinstance(tag, float):
+        return float(tag)
+    return int(tag)
+
+
+# Each operation builds the timed callable for a case; TEXT_OPERATIONS and JSON_OPERATIONS are measured against
+# the size of the SNBT and typed JSON text instead of the binary payload
+OPERATIONS: Dict[str, Callable[[Case], Callable[[], object]]] = {
+    "read": lambda case: lambda: nbt.read(case.path),
+    "read_zipped": lambda case: lambda: nbt.read_zipped(case.zipped_path),
+    "read_mapped": lambda case: lambda: nbt.read_mapped(case.path),
+    "write_out": lambda case: lambda: _write_out(case),
+    "NBTReader.read": lambda case: lambda: NBTReader.read(case.snbt),
+    "__str__": lambda case: lambda: str(case.tag),
+    "copy": lambda case: lambda: case.tag.copy(),
+    "build": lambda case: lambda: build(case.tag),
+    "copy+digest": lambda case: lambda: case.tag.copy().digest(),
+    "digest_cached": _digest_cached,
+    "to_json": lambda case: lambda: to_json(case.tag),
+    "to_json_plain": lambda case: lambda: to_json(case.tag, typed=False),
+    "naive json.dumps": lambda case: lambda: json.dumps(naive_json(case.tag), ensure_ascii=False),
+    "from_json": lambda case: lambda: from_json(case.json),
+}
+
+TEXT_OPERATIONS = {"NBTReader.read", "__str__"}
+JSON_OPERATIONS = {"to_json", "to_json_plain", "naive json.dumps", "from_json"}
+
+
+def _time(function: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(function: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(cases: List[Case], operations: List[str], repeat: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for case in cases:
+        for operation in operations:
+            function = OPERATIONS[operation](case)
+            seconds = _time(function, repeat)
+            if operation in TEXT_OPERATIONS:
+                size = len(case.snbt.encode('utf-8'))
+            elif operation in JSON_OPERATIONS:
+                size = len(case.json.encode('utf-8'))
+            else:
+                size = len(case.raw)
+            results[case.name + "/" + operation] = {
+                "seconds": seconds,
+                "mb_per_s": size / seconds / 1e6,
+                "tags_per_s": case.tags / seconds,
+                "peak_kib": _peak_memory(function) / 1024
+            }
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    regressions: List[str] = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        ratio = result["seconds"] / previous["seconds"]
+        result["baseline_ratio"] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(key)
+    return regressions
+
+
+def report(results: Dict[str, Dict[str, float]], regressions: List[str], out=sys.stdout) -> None:
+    header = "{:<32} {:>10} {:>10} {:>12} {:>11} {:>9}".format(
+        "benchmark", "ms", "MB/s", "tags/s", "peak KiB", "vs base")
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    for key, result in results.items():
+        ratio = result.get("baseline_ratio")
+        print("{:<32} {:>10.2f} {:>10.2f} {:>12.0f} {:>11.1f} {:>9}{}".format(
+            key, result["seconds"] * 1000, result["mb_per_s"], result["tags_per_s"], result["peak_kib"],
+            "-" if ratio is None else "{:.2f}x".format(ratio), " !" if key in regressions else ""), file=out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark NBT reading, writing and formatting")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scale", type=int, default=1, help="multiplies the size of every generated corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark, the fastest is kept")
+    parser.add_argument("--corpus", action="append", choices=sorted(corpus.GENERATORS))
+    parser.add_argument("--operation", action="append", choices=list(OPERATIONS))
+    parser.add_argument("--baseline", help="JSON file from a previous --save to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown before failing")
+    parser.add_argument("--save", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        generated = corpus.generate(args.seed, args.scale, args.corpus)
+        cases = [Case(name, tag, directory) for (name, tag) in generated.items()]
+        results = measure(cases, args.operation or list(OPERATIONS), args.repeat)
+
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline) as stream:
+            baseline = json.load(stream)
+        regressions = compare(results, baseline["results"], args.tolerance)
+
+    report(results, regressions)
+
+    if args.save:
+        with open(args.save, 'w') as stream:
+            json.dump({
+                "meta": {
+                    "seed": args.seed,
+                    "scale": args.scale,
+                    "repeat": args.repeat,
+                    "python": platform.python_version(),
+                    "platform": platform.platform()
+                },
+                "results": results
+            }, stream, indent=2)
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
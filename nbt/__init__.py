@@ -1,7 +1,17 @@
 from gzip import GzipFile
+from mmap import mmap, ACCESS_READ
+from typing import BinaryIO, Callable, Optional, Tuple
 
+import os
+import shutil
+import tempfile
+import weakref
+
+from nbt.binary import ColumnBatch, extract_columns, patch, patch_file, value_at
 from nbt.classes import *
-from nbt.json import NBTReader
+from nbt.json import NBTReader, from_json, to_json
+from nbt.region import RegionFile, RegionIndex
+from nbt.stream import MappedStream, NBTBudget, NBTLimitError
 
 __all__ = [
     'NBTBase',
@@ -13,35 +23,100 @@ __all__ = [
     'NBTTagFloat',
     'NBTTagDouble',
     'NBTTagByteArray',
+    'NBTTagByteArrayView',
     'NBTTagString',
     'NBTTagList',
     'NBTTagCompound',
     'NBTTagIntArray',
+    'NBTTagIntArrayView',
     'NBTTagLongArray',
+    'NBTTagLongArrayView',
     'NBTReader',
+    'from_json',
+    'to_json',
+    'RegionFile',
+    'RegionIndex',
+    'MappedStream',
+    'NBTBudget',
+    'ColumnBatch',
+    'extract_columns',
+    'patch',
+    'patch_file',
+    'value_at',
+    'NBTLimitError',
     'read',
     'read_zipped',
+    'read_mapped',
     'write',
     'write_zipped'
 ]
 
 
-def read(location: str) -> NBTBase:
+def read(location: str, budget: Optional[NBTBudget] = None) -> NBTBase:
     with open(location, 'rb') as stream:
-        return NBTBase.read_new_tag(stream)
+        return NBTBase.read_new_tag(stream, budget)
 
 
-def read_zipped(location: str) -> NBTBase:
+def read_zipped(location: str, budget: Optional[NBTBudget] = None) -> NBTBase:
     with GzipFile(location, 'rb') as stream:
-        return NBTBase.read_new_tag(stream)
+        return NBTBase.read_new_tag(stream, budget)
+
+
+def read_mapped(location: str, budget: Optional[NBTBudget] = None) -> NBTBase:
+    with open(location, 'rb') as stream:
+        mapped = mmap(stream.fileno(), 0, access=ACCESS_READ)
+        _mapped[mapped] = _file_key(os.fstat(stream.fileno()))
+    return NBTBase.read_new_tag(MappedStream(mapped), budget)
+
+
+# Files mapped by read_mapped, keyed by their mmap so entries go away once no view over the file is left
+_mapped: 'weakref.WeakKeyDictionary[mmap, Tuple[int, int]]' = weakref.WeakKeyDictionary()
+
+
+def _file_key(status: os.stat_result) -> Tuple[int, int]:
+    return status.st_dev, status.st_ino
+
+
+def _is_mapped(location: str) -> bool:
+    try:
+        key = _file_key(os.stat(location))
+    except FileNotFoundError:
+        return False
+    return key in _mapped.values()
+
+
+def _replace(location: str, write_to: Callable[[BinaryIO], None]):
+    # Truncating a file that read_mapped views still point into would pull the pages out from under them. Write
+    # beside it and swap the new file in instead, leaving the old inode mapped.
+    target = os.path.realpath(location)
+    descriptor, temporary = tempfile.mkstemp(prefix=os.path.basename(target) + '.', suffix='.tmp',
+                                             dir=os.path.dirname(target))
+    try:
+        with open(descriptor, 'wb') as stream:
+            write_to(stream)
+        shutil.copymode(target, temporary)
+        os.replace(temporary, target)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
 
 
 def write(nbt: NBTBase, location: str):
+    if _is_mapped(location):
+        _replace(location, nbt.write_out)
+        return
     with open(location, 'wb') as stream:
         nbt.write_out(stream)
 
 
 def write_zipped(nbt: NBTBase, location: str):
+    def write_to(raw: BinaryIO):
+        with GzipFile(location, 'wb', fileobj=raw) as stream:
+            nbt.write_out(stream)
+
+    if _is_mapped(location):
+        _replace(location, write_to)
+        return
     with GzipFile(location, 'wb') as stream:
         nbt.write_out(stream)
-
@@ -0,0 +1,12 @@
+from nbt.binary.columns import Column, ColumnBatch, extract_columns
+from nbt.binary.patch import locate, patch, patch_file, value_at
+
+__all__ = [
+    'Column',
+    'ColumnBatch',
+    'extract_columns',
+    'locate',
+    'patch',
+    'patch_file',
+    'value_at'
+]
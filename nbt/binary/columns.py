@@ -0,0 +1,249 @@
+import csv
+import os
+import struct
+import sys
+from array import array
+from struct import unpack_from
+from typing import Dict, Iterable, List, Optional, Union
+
+from nbt.binary.scanner import FIXED_FORMATS, FIXED_SIZES, ARRAY_ELEMENTS, read_payload, read_root, skip_payload, \
+    span_end
+from nbt.classes import *
+from nbt.path import Path, WILDCARD, format_path, parse_path
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# array.array type codes of the fixed-width tags; numpy uses the same characters for these dtypes
+TYPECODES = {1: 'b', 2: 'h', 3: 'i', 4: 'q', 5: 'f', 6: 'd'}
+NPY_KINDS = {'b': 'i', 'h': 'i', 'i': 'i', 'q': 'i', 'f': 'f', 'd': 'f'}
+
+
+class Column:
+
+    def __init__(self, name: str, path: Path):
+        self.name: str = name
+        self.path = parse_path(path)
+        self.tag_id: Optional[int] = None
+        self.values: Union[array, List, None] = None
+        self.mask: bytearray = bytearray()
+        self._leading_nulls: int = 0
+
+    def _start(self, tag_id: int) -> None:
+        self.tag_id = tag_id
+        if tag_id in TYPECODES:
+            self.values = array(TYPECODES[tag_id], bytes(self._leading_nulls * array(TYPECODES[tag_id]).itemsize))
+        else:
+            self.values = [None] * self._leading_nulls
+
+    def append_null(self) -> None:
+        self.mask.append(0)
+        if self.values is None:
+            self._leading_nulls += 1
+        elif self.tag_id in TYPECODES:
+            self.values.append(0)
+        else:
+            self.values.append(None)
+
+    def decode(self, buffer, offset: int, tag_id: int, row: int) -> int:
+        # A record repeating a key reaches the column again; the last value wins, as in NBTTagCompound.read
+        if len(self.mask) > row:
+            self.truncate(row)
+        if self.tag_id != tag_id:
+            if self.tag_id is not None:
+                raise RuntimeError("Column " + self.name + " holds tag type " + str(self.tag_id) +
+                                   " but record " + str(row) + " has tag type " + str(tag_id))
+            self._start(tag_id)
+
+        self.mask.append(1)
+        if tag_id in FIXED_SIZES:
+            self.values.append(unpack_from(FIXED_FORMATS[tag_id], buffer, offset)[0])
+            return offset + FIXED_SIZES[tag_id]
+        elif tag_id == 8:
+            length: int = unpack_from('!H', buffer, offset)[0]
+            end: int = span_end(buffer, offset + 2, length, 1, 'string')
+            self.values.append(NBTBase._decode_utf8(bytes(buffer[offset + 2:end])))
+            return end
+
+        tag, offset = read_payload(buffer, offset, tag_id)
+        self.values.append(tag)
+        return offset
+
+    def truncate(self, rows: int) -> None:
+        del self.mask[rows:]
+        if self.values is None:
+            self._leading_nulls = min(self._leading_nulls, rows)
+        else:
+            del self.values[rows:]
+
+    def to_list(self) -> List:
+        values = self.values if self.values is not None else [None] * self._leading_nulls
+        return [value if present else None for (value, present) in zip(values, self.mask)]
+
+    def to_numpy(self):
+        if numpy is None:
+            raise ImportError("numpy is required to convert columns to arrays")
+        if self.tag_id in TYPECODES:
+            data = numpy.frombuffer(self.values, dtype=self.values.typecode)
+        elif self.tag_id == 8:
+            data = numpy.array([value or "" for value in self.values], dtype=str)
+        else:
+            data = numpy.array(self.values if self.values is not None else [None] * self._leading_nulls, dtype=object)
+        return numpy.ma.masked_array(data, mask=numpy.frombuffer(self.mask, dtype=numpy.uint8) == 0)
+
+    def __len__(self) -> int:
+        return len(self.mask)
+
+
+class _PathNode:
+
+    def __init__(self):
+        self.column: Optional[Column] = None
+        self.children: Dict[Union[bytes, int], '_PathNode'] = {}
+
+
+class ColumnBatch:
+
+    def __init__(self, fields: Dict[str, Path]):
+        self.columns: Dict[str, Column] = {}
+        self.rows: int = 0
+        self._root = _PathNode()
+
+        for (name, path) in fields.items():
+            column = Column(name, path)
+            if not column.path:
+                raise ValueError("Column " + name + " has an empty path")
+            node = self._root
+            for segment in column.path:
+                if segment == WILDCARD:
+                    raise ValueError("Column " + name + " fans out with '*'; columns need one value per record")
+                if node.column is not None:
+                    raise ValueError("Column " + name + " is nested inside column " + node.column.name)
+                child = node.children.setdefault(NBTBase._encode_utf8(str(segment)), _PathNode())
+                # Numeric segments index lists and arrays, but may also name a compound key
+                if isinstance(segment, int):
+                    child = node.children.setdefault(segment, child)
+                node = child
+            if node.column is not None or node.children:
+                raise ValueError("Column " + name + " overlaps another column at " + format_path(column.path))
+            node.column = column
+            self.columns[name] = column
+
+    def add(self, payload) -> None:
+        try:
+            tag_id, offset = read_root(payload)
+            if tag_id == 10:
+                self._scan_compound(payload, offset, self._root)
+        except (IndexError, struct.error) as error:
+            self._discard_row()
+            raise RuntimeError("Malformed input: record " + str(self.rows) + " is truncated") from error
+        except BaseException:
+            self._discard_row()
+            raise
+        self.rows += 1
+        for column in self.columns.values():
+            if len(column) < self.rows:
+                column.append_null()
+
+    def _discard_row(self) -> None:
+        # Columns filled before the record turned out to be malformed must not keep its values
+        for column in self.columns.values():
+            column.truncate(self.rows)
+
+    def extend(self, payloads: Iterable) -> 'ColumnBatch':
+        for payload in payloads:
+            self.add(payload)
+        return self
+
+    def _scan_compound(self, buffer, offset: int, node: _PathNode) -> int:
+        children = node.children
+        while True:
+            tag_id: int = buffer[offset]
+            offset += 1
+            if tag_id == 0:
+                return offset
+            length: int = unpack_from('!H', buffer, offset)[0]
+            child = children.get(bytes(buffer[offset + 2:offset + 2 + length]))
+            offset += 2 + length
+            if child is None:
+                offset = skip_payload(buffer, offset, tag_id)
+            else:
+                offset = self._scan_value(buffer, offset, tag_id, child)
+
+    def _scan_value(self, buffer, offset: int, tag_id: int, node: _PathNode) -> int:
+        if node.column is not None:
+            return node.column.decode(buffer, offset, tag_id, self.rows)
+        elif tag_id == 10:
+            return self._scan_compound(buffer, offset, node)
+        elif tag_id == 9:
+            element, length = unpack_from('!Bi', buffer, offset)
+            offset += 5
+            if element in FIXED_SIZES:
+                end: int = span_end(buffer, offset, length, FIXED_SIZES[element], 'list')
+                for (index, child) in node.children.items():
+                    if isinstance(index, int) and 0 <= index < length:
+                        self._scan_value(buffer, offset + index * FIXED_SIZES[element], element, child)
+                return end
+            if length < 0:
+                raise RuntimeError("Negative list length " + str(length) + " at byte " + str(offset - 4))
+            for index in range(length):
+                child = node.children.get(index)
+                if child is None:
+                    offset = skip_payload(buffer, offset, element)
+                else:
+                    offset = self._scan_value(buffer, offset, element, child)
+            return offset
+        elif tag_id in ARRAY_ELEMENTS:
+            length: int = unpack_from('!i', buffer, offset)[0]
+            element, size = ARRAY_ELEMENTS[tag_id]
+            end: int = span_end(buffer, offset + 4, length, size, 'array')
+            for (index, child) in node.children.items():
+                if isinstance(index, int) and 0 <= index < length:
+                    self._scan_value(buffer, offset + 4 + index * size, element, child)
+            return end
+        return skip_payload(buffer, offset, tag_id)
+
+    def to_numpy(self) -> Dict[str, object]:
+        return {name: column.to_numpy() for (name, column) in self.columns.items()}
+
+    def write_csv(self, location: str) -> None:
+        with open(location, 'w', newline='', encoding='utf-8') as stream:
+            writer = csv.writer(stream)
+            writer.writerow(self.columns.keys())
+            for row in zip(*(column.to_list() for column in self.columns.values())):
+                writer.writerow(["" if value is None else value for value in row])
+
+    def write_npy(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        for (name, column) in self.columns.items():
+            if column.tag_id in TYPECODES:
+                descr = ('<' if sys.byteorder == 'little' else '>') + NPY_KINDS[column.values.typecode] + \
+                    str(column.values.itemsize)
+                data = column.values.tobytes()
+            elif column.tag_id == 8 or column.tag_id is None:
+                strings = [value or "" for value in (column.values or [None] * len(column))]
+                width = max([len(value) for value in strings] + [1])
+                descr = '<U' + str(width)
+                data = b''.join(value.ljust(width, '\0').encode('utf-32-le') for value in strings)
+            else:
+                raise RuntimeError("Column " + name + " holds tag type " + str(column.tag_id) +
+                                   " which cannot be stored in a .npy file")
+            _write_npy(os.path.join(directory, name + ".npy"), descr, len(column), data)
+            _write_npy(os.path.join(directory, name + ".mask.npy"), '|b1', len(column), bytes(column.mask))
+
+
+def _write_npy(location: str, descr: str, length: int, data: bytes) -> None:
+    header = "{'descr': '" + descr + "', 'fortran_order': False, 'shape': (" + str(length) + ",), }"
+    # Version 1.0 headers are padded with spaces so the data starts on a 64 byte boundary
+    header += ' ' * (-(10 + len(header) + 1) % 64) + '\n'
+    with open(location, 'wb') as stream:
+        stream.write(b'\x93NUMPY\x01\x00')
+        stream.write(len(header).to_bytes(2, 'little'))
+        stream.write(header.encode('latin-1'))
+        stream.write(data)
+
+
+def extract_columns(fields: Dict[str, Path], payloads: Iterable) -> ColumnBatch:
+    return ColumnBatch(fields).extend(payloads)
@@ -0,0 +1,93 @@
+import io
+import mmap
+from struct import unpack_from
+from typing import Tuple
+
+from nbt.binary.scanner import FIXED_SIZES, ARRAY_ELEMENTS, read_payload, read_root, skip_payload
+from nbt.classes import *
+from nbt.path import Path, WILDCARD, format_path, parse_path
+
+
+def locate(buffer, path: Path) -> Tuple[int, int, int]:
+    tag_id, offset = read_root(buffer)
+    for segment in parse_path(path):
+        if segment == WILDCARD:
+            raise ValueError("Cannot patch through '*' in " + format_path(path))
+
+        if tag_id == 10:
+            key: bytes = NBTBase._encode_utf8(str(segment))
+            while True:
+                child_id: int = buffer[offset]
+                offset += 1
+                if child_id == 0:
+                    raise KeyError("No tag at " + format_path(path))
+                length: int = unpack_from('!H', buffer, offset)[0]
+                offset += 2 + length
+                if buffer[offset - length:offset] == key:
+                    tag_id = child_id
+                    break
+                offset = skip_payload(buffer, offset, child_id)
+        elif tag_id == 9 and isinstance(segment, int):
+            element, length = unpack_from('!Bi', buffer, offset)
+            offset += 5
+            if not 0 <= segment < length:
+                raise IndexError("List index " + str(segment) + " out of range in " + format_path(path))
+            if element in FIXED_SIZES:
+                offset += segment * FIXED_SIZES[element]
+            else:
+                for _ in range(segment):
+                    offset = skip_payload(buffer, offset, element)
+            tag_id = element
+        elif tag_id in ARRAY_ELEMENTS and isinstance(segment, int):
+            length: int = unpack_from('!i', buffer, offset)[0]
+            if not 0 <= segment < length:
+                raise IndexError("Array index " + str(segment) + " out of range in " + format_path(path))
+            tag_id, size = ARRAY_ELEMENTS[tag_id]
+            offset += 4 + segment * size
+        else:
+            raise KeyError("No tag at " + format_path(path))
+
+    return tag_id, offset, skip_payload(buffer, offset, tag_id)
+
+
+def value_at(buffer, path: Path) -> NBTBase:
+    tag_id, start, _ = locate(buffer, path)
+    return read_payload(buffer, start, tag_id)[0]
+
+
+def encode_payload(tag_id: int, value) -> bytes:
+    if not isinstance(value, NBTBase):
+        value = NBTBase._get_class(tag_id)(value)
+    elif value.id() != tag_id:
+        raise RuntimeError("Cannot replace tag type " + str(tag_id) + " with tag type " + str(value.id()))
+    stream = io.BytesIO()
+    value.write(stream)
+    return stream.getvalue()
+
+
+def patch(buffer, path: Path, value) -> int:
+    tag_id, start, end = locate(buffer, path)
+    payload: bytes = encode_payload(tag_id, value)
+    if len(payload) != end - start and not isinstance(buffer, bytearray):
+        raise RuntimeError("Changing the size of " + format_path(path) + " needs a bytearray buffer")
+    # Same-size payloads overwrite in place; otherwise only the tail after the tag moves
+    buffer[start:end] = payload
+    return len(payload) - (end - start)
+
+
+def patch_file(location: str, path: Path, value) -> int:
+    with open(location, 'r+b') as stream:
+        with mmap.mmap(stream.fileno(), 0) as mapped:
+            tag_id, start, end = locate(mapped, path)
+            payload: bytes = encode_payload(tag_id, value)
+            if len(payload) == end - start:
+                mapped[start:end] = payload
+                return 0
+            tail: bytes = mapped[end:]
+
+        stream.seek(start)
+        stream.write(payload)
+        stream.write(tail)
+        stream.truncate()
+        return len(payload) - (end - start)
+
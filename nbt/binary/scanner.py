@@ -0,0 +1,82 @@
+import io
+from struct import unpack_from
+from typing import List, Tuple
+
+from nbt.classes import *
+
+# Payload sizes and struct formats of the fixed-width tags, keyed by tag id
+FIXED_SIZES = {1: 1, 2: 2, 3: 4, 4: 8, 5: 4, 6: 8}
+FIXED_FORMATS = {1: '!b', 2: '!h', 3: '!i', 4: '!q', 5: '!f', 6: '!d'}
+
+# Element tag id and element size of the array tags, keyed by tag id
+ARRAY_ELEMENTS = {7: (1, 1), 11: (3, 4), 12: (4, 8)}
+
+
+def read_root(buffer, offset: int = 0) -> Tuple[int, int]:
+    tag_id: int = buffer[offset]
+    offset += 1
+    if tag_id != 0:
+        offset += 2 + unpack_from('!H', buffer, offset)[0]
+    return tag_id, offset
+
+
+def span_end(buffer, offset: int, length: int, size: int, kind: str) -> int:
+    if length < 0:
+        raise RuntimeError("Negative " + kind + " length " + str(length) + " at byte " + str(offset))
+    end: int = offset + length * size
+    if end > len(buffer):
+        raise RuntimeError("Malformed input: " + kind + " at byte " + str(offset) + " runs past the end of the buffer")
+    return end
+
+
+def skip_payload(buffer, offset: int, tag_id: int) -> int:
+    # Frames are [element id, remaining] for lists and [None, 0] for compounds
+    stack: List[list] = []
+    while True:
+        if tag_id in FIXED_SIZES:
+            offset += FIXED_SIZES[tag_id]
+        elif tag_id == 8:
+            offset += 2 + unpack_from('!H', buffer, offset)[0]
+        elif tag_id in ARRAY_ELEMENTS:
+            length: int = unpack_from('!i', buffer, offset)[0]
+            offset = span_end(buffer, offset + 4, length, ARRAY_ELEMENTS[tag_id][1], 'array')
+        elif tag_id == 9:
+            element, length = unpack_from('!Bi', buffer, offset)
+            offset += 5
+            if element in FIXED_SIZES:
+                offset = span_end(buffer, offset, length, FIXED_SIZES[element], 'list')
+            elif length < 0:
+                raise RuntimeError("Negative list length " + str(length) + " at byte " + str(offset))
+            elif length > 0:
+                stack.append([element, length])
+        elif tag_id == 10:
+            stack.append([None, 0])
+        elif tag_id != 0:
+            raise RuntimeError("Unknown tag type " + str(tag_id) + " at byte " + str(offset))
+
+        while stack:
+            frame = stack[-1]
+            if frame[0] is None:
+                tag_id = buffer[offset]
+                offset += 1
+                if tag_id == 0:
+                    stack.pop()
+                    continue
+                offset += 2 + unpack_from('!H', buffer, offset)[0]
+                break
+            elif frame[1] == 0:
+                stack.pop()
+            else:
+                frame[1] -= 1
+                tag_id = frame[0]
+                break
+        else:
+            if offset > len(buffer):
+                raise RuntimeError("Malformed input: tag runs past the end of the buffer")
+            return offset
+
+
+def read_payload(buffer, offset: int, tag_id: int) -> Tuple[NBTBase, int]:
+    # Decode from a copy of just this payload so no array view keeps the caller's buffer exported
+    end: int = skip_payload(buffer, offset, tag_id)
+    return NBTBase.read_in(tag_id, io.BytesIO(bytes(buffer[offset:end])), 0), end
@@ -13,9 +13,12 @@ __all__ = [
     'NBTTagFloat',
     'NBTTagDouble',
     'NBTTagByteArray',
+    'NBTTagByteArrayView',
     'NBTTagString',
     'NBTTagList',
     'NBTTagCompound',
     'NBTTagIntArray',
-    'NBTTagLongArray'
+    'NBTTagIntArrayView',
+    'NBTTagLongArray',
+    'NBTTagLongArrayView'
 ]
@@ -1,18 +1,32 @@
-from typing import BinaryIO, List
+from abc import abstractmethod as abstract, ABCMeta as AbstractClass
+from array import array
 
-from nbt.classes.base import NBTBase
+from typing import BinaryIO, Iterator, List, Optional, Type
 
+from nbt.classes.base import NBTBase, NBTMutable, DIGEST_SIZE, LIST_MUTATORS, SORTED_LIST_MUTATORS, \
+    _track_mutations
 
-class NBTTagByteArray(NBTBase, bytearray):
+import hashlib
+import struct
+import sys
+
+
+@_track_mutations(LIST_MUTATORS)
+class NBTTagByteArray(NBTMutable, bytearray):
 
     def write(self, data_stream: BinaryIO) -> None:
         self._write(data_stream, 'i', len(self))
         data_stream.write(self)
 
+    def _digest_payload(self) -> bytes:
+        return bytes(self)
+
     @classmethod
     def read(cls, data_stream: BinaryIO, depth: int) -> 'NBTBase':
-        size: int = cls._read(data_stream, 'i')
-        return NBTTagByteArray(data_stream.read(size))
+        if getattr(data_stream, 'zero_copy', False):
+            return NBTTagByteArrayView.read(data_stream, depth)
+        size: int = cls._read_length(data_stream, 'array', 1)
+        return NBTTagByteArray(cls._read_exactly(data_stream, size))
 
     @classmethod
     def id(cls) -> int:
@@ -44,22 +58,28 @@ class NBTTagString(NBTBase, str):
         return 8
 
     def copy(self) -> 'NBTBase':
-        return NBTTagString(self)
+        return NBTTagString(self[:])
 
     def __str__(self) -> str:
         return self._quote_escape(self)
 
 
-class NBTTagIntArray(NBTBase, List[int]):
+@_track_mutations(SORTED_LIST_MUTATORS)
+class NBTTagIntArray(NBTMutable, List[int]):
 
     def write(self, data_stream: BinaryIO) -> None:
         self._write(data_stream, 'i', len(self))
         for i in self:
             self._write(data_stream, 'i', i)
 
+    def _digest_payload(self) -> bytes:
+        return struct.pack("!%di" % len(self), *self)
+
     @classmethod
     def read(cls, data_stream: BinaryIO, depth: int) -> 'NBTBase':
-        size: int = cls._read(data_stream, 'i')
+        if getattr(data_stream, 'zero_copy', False):
+            return NBTTagIntArrayView.read(data_stream, depth)
+        size: int = cls._read_length(data_stream, 'array', 4)
         return NBTTagIntArray([cls._read(data_stream, 'i') for _ in range(size)])
 
     @classmethod
@@ -78,16 +98,22 @@ class NBTTagIntArray(NBTBase, List[int]):
         return out + "]"
 
 
-class NBTTagLongArray(NBTBase, List[int]):
+@_track_mutations(SORTED_LIST_MUTATORS)
+class NBTTagLongArray(NBTMutable, List[int]):
 
     def write(self, data_stream: BinaryIO) -> None:
         self._write(data_stream, 'i', len(self))
         for i in self:
             self._write(data_stream, 'q', i)
 
+    def _digest_payload(self) -> bytes:
+        return struct.pack("!%dq" % len(self), *self)
+
     @classmethod
     def read(cls, data_stream: BinaryIO, depth: int) -> 'NBTBase':
-        size: int = cls._read(data_stream, 'i')
+        if getattr(data_stream, 'zero_copy', False):
+            return NBTTagLongArrayView.read(data_stream, depth)
+        size: int = cls._read_length(data_stream, 'array', 8)
         return NBTTagLongArray([cls._read(data_stream, 'q') for _ in range(size)])
 
     @classmethod
@@ -104,3 +130,157 @@ class NBTTagLongArray(NBTBase, List[int]):
                 out += ","
             out += str(long) + "L"
         return out + "]"
+
+
+class NBTTagByteArrayView(NBTBase):
+
+    _lazy_view = True
+
+    def __init__(self, data: memoryview):
+        self.data: memoryview = data
+
+    def write(self, data_stream: BinaryIO) -> None:
+        self._write(data_stream, 'i', len(self.data))
+        data_stream.write(self.data)
+
+    @classmethod
+    def read(cls, data_stream: BinaryIO, depth: int) -> 'NBTBase':
+        size: int = cls._read_length(data_stream, 'array', 1)
+        return cls(cls._read_exactly(data_stream, size))
+
+    @classmethod
+    def id(cls) -> int:
+        return 7
+
+    def _digest(self) -> bytes:
+        if self._digest_cache is None:
+            self._digest_cache = hashlib.blake2b(bytes((self.id(),)) + self.data, digest_size=DIGEST_SIZE).digest()
+        return self._digest_cache
+
+    def copy(self) -> 'NBTBase':
+        return NBTTagByteArray(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.data)
+
+    def __bytes__(self) -> bytes:
+        return self.data.tobytes()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, NBTTagByteArrayView):
+            other = other.data
+        return isinstance(other, (bytes, bytearray, memoryview)) and self.data == other
+
+    __hash__ = None
+
+    def __str__(self) -> str:
+        return str(self.copy())
+
+
+class NBTLazyArrayView(NBTBase, metaclass=AbstractClass):
+
+    _lazy_view = True
+
+    def __init__(self, data: memoryview):
+        self.data: memoryview = data
+        self._values: Optional[array] = None
+
+    @classmethod
+    @abstract
+    def format(cls) -> str:
+        pass
+
+    @classmethod
+    @abstract
+    def materialized_type(cls) -> Type[NBTBase]:
+        pass
+
+    def _decoded(self) -> array:
+        # Kept private so the cache can never diverge from the bytes the view writes out
+        if self._values is None:
+            values = array(self.format())
+            values.frombytes(self.data)
+            if sys.byteorder == 'little':
+                values.byteswap()
+            self._values = values
+        return self._values
+
+    def materialize(self) -> NBTBase:
+        return self.materialized_type()(self._decoded())
+
+    def write(self, data_stream: BinaryIO) -> None:
+        self._write(data_stream, 'i', len(self))
+        data_stream.write(self.data)
+
+    @classmethod
+    def read(cls, data_stream: BinaryIO, depth: int) -> 'NBTBase':
+        size: int = cls._read_length(data_stream, 'array', struct.calcsize(cls.format()))
+        return cls(cls._read_exactly(data_stream, size * struct.calcsize(cls.format())))
+
+    def _digest(self) -> bytes:
+        if self._digest_cache is None:
+            self._digest_cache = hashlib.blake2b(bytes((self.id(),)) + self.data, digest_size=DIGEST_SIZE).digest()
+        return self._digest_cache
+
+    def copy(self) -> 'NBTBase':
+        return self.materialize()
+
+    def __len__(self) -> int:
+        return len(self.data) // struct.calcsize(self.format())
+
+    def __getitem__(self, index):
+        if self._values is not None or not isinstance(index, int):
+            return self._decoded()[index].tolist() if isinstance(index, slice) else self._decoded()[index]
+        size = len(self)
+        if not -size <= index < size:
+            raise IndexError("array index out of range")
+        return struct.unpack_from("!" + self.format(), self.data, (index % size) * struct.calcsize(self.format()))[0]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._decoded())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, NBTLazyArrayView):
+            return type(self) is type(other) and self.data == other.data
+        return self._decoded().tolist() == other
+
+    __hash__ = None
+
+    def __str__(self) -> str:
+        return str(self.materialize())
+
+
+class NBTTagIntArrayView(NBTLazyArrayView):
+
+    @classmethod
+    def format(cls) -> str:
+        return 'i'
+
+    @classmethod
+    def materialized_type(cls) -> Type[NBTBase]:
+        return NBTTagIntArray
+
+    @classmethod
+    def id(cls) -> int:
+        return 11
+
+
+class NBTTagLongArrayView(NBTLazyArrayView):
+
+    @classmethod
+    def format(cls) -> str:
+        return 'q'
+
+    @classmethod
+    def materialized_type(cls) -> Type[NBTBase]:
+        return NBTTagLongArray
+
+    @classmethod
+    def id(cls) -> int:
+        return 12
@@ -1,12 +1,26 @@
 from abc import abstractmethod as abstract, ABCMeta as AbstractClass
 
-from typing import BinaryIO, Union, Optional, Type
+from typing import BinaryIO, Dict, Iterable, List, Union, Optional, Tuple, Type
 
+from nbt.stream.budget import BudgetedStream, NBTBudget
+
+import hashlib
+import io
 import struct
+import weakref
+
+DIGEST_SIZE = 16
+
+# Smallest possible payload of each tag type, used to reject lengths the remaining input cannot hold
+MIN_PAYLOAD_SIZES = {0: 0, 1: 1, 2: 2, 3: 4, 4: 8, 5: 4, 6: 8, 7: 4, 8: 2, 9: 5, 10: 1, 11: 4, 12: 4}
 
 
 class NBTBase(metaclass=AbstractClass):
 
+    _digest_cache: Optional[bytes] = None
+    # Views share an id with the tag they stand in for, but are never picked when decoding by id
+    _lazy_view: bool = False
+
     @staticmethod
     def _quote_escape(unescaped: str) -> str:
         out = '"'
@@ -22,12 +36,14 @@ class NBTBase(metaclass=AbstractClass):
 
         while all_subclasses:
             sub = all_subclasses.pop()
-            if sub.id() == tag_id:
+            if not sub._lazy_view and sub.id() == tag_id:
                 return sub
             all_subclasses.extend(sub.__subclasses__())
 
     @staticmethod
-    def read_new_tag(stream: BinaryIO) -> Optional['NBTBase']:
+    def read_new_tag(stream: BinaryIO, budget: Optional[NBTBudget] = None) -> Optional['NBTBase']:
+        if budget is not None:
+            stream = BudgetedStream(stream, budget)
         tag_type: int = NBTBase._read(stream, 'B')
         if tag_type == 0:
             return NBTBase.read_in(0, stream, 0)
@@ -37,8 +53,20 @@ class NBTBase(metaclass=AbstractClass):
     @staticmethod
     def read_in(tag_id: int, stream: BinaryIO, depth: int) -> Optional['NBTBase']:
         sub_class = NBTBase._get_class(tag_id)
-        if sub_class is not None:
-            return sub_class.read(stream, depth)
+        if sub_class is None:
+            raise RuntimeError("Unknown tag type " + str(tag_id))
+        if isinstance(stream, BudgetedStream):
+            stream.count_tag()
+        return sub_class.read(stream, depth)
+
+    @staticmethod
+    def _read_length(data_stream: BinaryIO, kind: str, element_size: int) -> int:
+        length: int = NBTBase._read(data_stream, 'i')
+        if length < 0:
+            raise RuntimeError("Negative " + kind + " length " + str(length))
+        if isinstance(data_stream, BudgetedStream):
+            data_stream.check_length(kind, length, element_size)
+        return length
 
     @staticmethod
     def _write(data_stream: BinaryIO, fmt: str, *args: Union[int, float]):
@@ -46,87 +74,71 @@ class NBTBase(metaclass=AbstractClass):
 
     @staticmethod
     def _read(data_stream: BinaryIO, fmt: str) -> Union[int, float]:
-        return struct.unpack("!" + fmt, data_stream.read(struct.calcsize(fmt)))[0]
+        return struct.unpack("!" + fmt, NBTBase._read_exactly(data_stream, struct.calcsize(fmt)))[0]
 
     @staticmethod
-    def _write_utf8(data_stream: BinaryIO, value: str):
-        utf_len: int = 0
+    def _read_exactly(data_stream: BinaryIO, size: int):
+        data = data_stream.read(size)
+        if len(data) < size:
+            raise RuntimeError("Malformed input: expected " + str(size) + " bytes but only " + str(len(data)) +
+                               " remain")
+        return data
 
-        for i in value:
-            char = ord(i)
-            if 0x0001 <= char <= 0x007F:
-                utf_len += 1
-            elif char > 0x07FF:
-                utf_len += 3
-            else:
-                utf_len += 2
+    @staticmethod
+    def _encode_utf8(value: str) -> bytes:
+        if value.isascii() and '\0' not in value:
+            encoded: bytes = value.encode('ascii')
+        else:
+            encoded = bytearray()
+            for i in value:
+                char = ord(i)
+                if 0x0001 <= char <= 0x007F:
+                    encoded.append(char)
+                elif char > 0xFFFF:
+                    char -= 0x10000
+                    for surrogate in (0xD800 | (char >> 10), 0xDC00 | (char & 0x3FF)):
+                        encoded += bytes((0xE0 | ((surrogate >> 12) & 0x0F),
+                                          0x80 | ((surrogate >> 6) & 0x3F),
+                                          0x80 | (surrogate & 0x3F)))
+                elif char > 0x07FF:
+                    encoded += bytes((0xE0 | ((char >> 12) & 0x0F),
+                                      0x80 | ((char >> 6) & 0x3F),
+                                      0x80 | (char & 0x3F)))
+                else:
+                    encoded += bytes((0xC0 | ((char >> 6) & 0x1F),
+                                      0x80 | (char & 0x3F)))
+        return bytes(encoded)
 
+    @staticmethod
+    def _write_utf8(data_stream: BinaryIO, value: str):
+        encoded: bytes = NBTBase._encode_utf8(value)
+        utf_len: int = len(encoded)
         if utf_len > 65535:
-            raise RuntimeError("Encoded string too long: " + utf_len + " bytes")
+            raise RuntimeError("Encoded string too long: " + str(utf_len) + " bytes")
 
         NBTBase._write(data_stream, 'H', utf_len)
-
-        for i in value:
-            char = ord(i)
-            if not 0x0001 <= char <= 0x007F:
-                break
-            NBTBase._write(data_stream, 'c', char)
-
-        for i in value:
-            char = ord(i)
-            if 0x0001 <= char <= 0x007F:
-                NBTBase._write(data_stream, 'c', char)
-            elif char > 0x07FF:
-                NBTBase._write(data_stream, 'ccc',
-                               (0xE0 | ((char >> 12) & 0x0F)),
-                               (0x80 | ((char >> 6) & 0x3F)),
-                               (0x80 | (char & 0x3F)))
-            else:
-                NBTBase._write(data_stream, 'cc',
-                               (0xC0 | ((char >> 6) & 0x1F)),
-                               (0x80 | (char & 0x3F)))
+        data_stream.write(encoded)
 
     @staticmethod
     def _read_utf8(data_stream: BinaryIO) -> str:
         utf_len: int = NBTBase._read(data_stream, "H")
-        byte_data: bytes = data_stream.read(utf_len)
-        out: str = ""
-
-        pos: int = 0
-
-        while pos < utf_len:
-            char = byte_data[pos]
-            if char > 0xFF:
-                break
-            pos += 1
-            out += chr(char)
-
-        while pos < utf_len:
-            char = byte_data[pos]
-            pointer = char >> 4
-            if 0x0000 <= pointer <= 0x0111:
-                pos += 1
-                out += chr(char)
-            elif 0x1100 <= pointer <= 0x1101:
-                pos += 2
-                if pos > utf_len:
-                    raise RuntimeError("Malformed input: partial character at end")
-                char_part = byte_data[pos - 1]
-                if (char_part & 0xC0) != 0x80:
-                    raise RuntimeError("Malformed input around byte " + str(pos))
-                out += chr(((char & 0x1F) << 6) | (char_part & 0x3F))
-            elif pointer == 0x1110:
-                pos += 3
-                if pos > utf_len:
-                    raise RuntimeError("Malformed input: partial character at end")
-                char_part = byte_data[pos - 2]
-                char_extra = byte_data[pos - 1]
-                if (char_part & 0xC0) != 0x80 or (char_extra & 0xC0) != 0x80:
-                    raise RuntimeError("Malformed input around byte " + str(pos - 1))
-
-                out += chr(((char & 0x0F) << 12) | ((char_part & 0x3F) << 6) | (char_extra & 0x3F))
-
-        return out
+        if isinstance(data_stream, BudgetedStream):
+            data_stream.check_length('string', utf_len, 1)
+        byte_data: bytes = bytes(NBTBase._read_exactly(data_stream, utf_len))
+        return NBTBase._decode_utf8(byte_data)
+
+    @staticmethod
+    def _decode_utf8(byte_data: bytes) -> str:
+        if byte_data.isascii():
+            return byte_data.decode('ascii')
+
+        try:
+            out: str = byte_data.replace(b'\xC0\x80', b'\0').decode('utf-8', 'surrogatepass')
+        except UnicodeDecodeError as error:
+            raise RuntimeError("Malformed input around byte " + str(error.start)) from error
+
+        # Supplementary characters are stored as surrogate pairs; join them back together, keeping lone surrogates
+        return out.encode('utf-16-be', 'surrogatepass').decode('utf-16-be', 'surrogatepass')
 
     def write_out(self, data_stream: BinaryIO):
         self._write(data_stream, 'B', self.id())
@@ -134,6 +146,26 @@ class NBTBase(metaclass=AbstractClass):
             self._write_utf8(data_stream, "")
             self.write(data_stream)
 
+    def write_canonical(self, data_stream: BinaryIO) -> None:
+        self.write(data_stream)
+
+    def canonical_bytes(self) -> bytes:
+        stream = io.BytesIO()
+        self._write(stream, 'B', self.id())
+        self.write_canonical(stream)
+        return stream.getvalue()
+
+    def digest(self) -> bytes:
+        return self._digest()
+
+    def same_content(self, other: 'NBTBase') -> bool:
+        return isinstance(other, NBTBase) and self.digest() == other.digest()
+
+    def _digest(self) -> bytes:
+        if self._digest_cache is None:
+            self._digest_cache = hashlib.blake2b(self.canonical_bytes(), digest_size=DIGEST_SIZE).digest()
+        return self._digest_cache
+
     @abstract
     def write(self, data_stream: BinaryIO) -> None:
         pass
@@ -157,6 +189,121 @@ class NBTBase(metaclass=AbstractClass):
         pass
 
 
+class NBTMutable(NBTBase, metaclass=AbstractClass):
+
+    # Containers that hashed this one; they are invalidated with it. Links are made while hashing, so tags that
+    # never compute a digest pay nothing beyond the cache check in each mutator.
+    _parents: Optional[List[weakref.ref]] = None
+
+    def invalidate_digest(self) -> None:
+        # Writes that bypass the tracked methods, like memoryview(byte_array)[0] = 1, must call this themselves
+        pending: List[NBTMutable] = [self]
+        while pending:
+            tag = pending.pop()
+            # A cached container only ever holds cached children, so an uncached tag has no cached parents left
+            if tag._digest_cache is None:
+                continue
+            tag._digest_cache = None
+            if tag._parents:
+                for ref in tag._parents:
+                    parent = ref()
+                    if parent is not None:
+                        pending.append(parent)
+
+    def _add_parent(self, parent: 'NBTMutable') -> None:
+        if self._parents is None:
+            self._parents = [weakref.ref(parent)]
+            return
+        live: List[weakref.ref] = []
+        for ref in self._parents:
+            current = ref()
+            if current is parent:
+                return
+            if current is not None:
+                live.append(ref)
+        live.append(weakref.ref(parent))
+        self._parents = live
+
+    def __reduce_ex__(self, protocol):
+        # Weak references cannot be pickled, and a copy must not invalidate the original's parents; both are
+        # rebuilt by the next digest() anyway
+        reduced = super().__reduce_ex__(protocol)
+        if len(reduced) > 2 and isinstance(reduced[2], dict):
+            state = {name: value for (name, value) in reduced[2].items()
+                     if name not in ('_parents', '_digest_cache')}
+            reduced = reduced[:2] + (state or None,) + reduced[3:]
+        return reduced
+
+    def _digest_children(self) -> Iterable[Tuple[bytes, NBTBase]]:
+        return ()
+
+    def _digest_payload(self) -> bytes:
+        return b''
+
+    def _digest(self) -> bytes:
+        if self._digest_cache is not None:
+            return self._digest_cache
+
+        hasher = hashlib.blake2b(bytes((self.id(),)), digest_size=DIGEST_SIZE)
+        hasher.update(self._digest_payload())
+        for (label, child) in self._digest_children():
+            hasher.update(label)
+            hasher.update(child._digest())
+            if isinstance(child, NBTMutable):
+                child._add_parent(self)
+
+        self._digest_cache = hasher.digest()
+        return self._digest_cache
+
+
+def _mutator(original, arity: Optional[int]):
+    # Fixed signatures for the common mutators; collecting *args costs as much again as the call itself
+    if arity == 0:
+        def mutator(self):
+            if self._digest_cache is not None:
+                self.invalidate_digest()
+            return original(self)
+    elif arity == 1:
+        def mutator(self, value):
+            if self._digest_cache is not None:
+                self.invalidate_digest()
+            return original(self, value)
+    elif arity == 2:
+        def mutator(self, key, value):
+            if self._digest_cache is not None:
+                self.invalidate_digest()
+            return original(self, key, value)
+    else:
+        def mutator(self, *args, **kwargs):
+            if self._digest_cache is not None:
+                self.invalidate_digest()
+            return original(self, *args, **kwargs)
+    return mutator
+
+
+def _track_mutations(mutators: Dict[str, Optional[int]]):
+    def decorate(cls: Type[NBTMutable]) -> Type[NBTMutable]:
+        for (name, arity) in mutators.items():
+            mutator = _mutator(getattr(cls, name), arity)
+            mutator.__name__ = name
+            setattr(cls, name, mutator)
+        return cls
+
+    return decorate
+
+
+# Mutating methods and their argument counts, None where they take optional or keyword arguments
+LIST_MUTATORS: Dict[str, Optional[int]] = {
+    '__setitem__': 2, '__delitem__': 1, '__iadd__': 1, '__imul__': 1, 'append': 1, 'extend': 1,
+    'insert': 2, 'pop': None, 'remove': 1, 'clear': 0, 'reverse': 0
+}
+SORTED_LIST_MUTATORS: Dict[str, Optional[int]] = dict(LIST_MUTATORS, sort=None)
+DICT_MUTATORS: Dict[str, Optional[int]] = {
+    '__setitem__': 2, '__delitem__': 1, '__ior__': 1, 'pop': None, 'popitem': 0, 'clear': 0,
+    'update': None, 'setdefault': None
+}
+
+
 class NBTPrimitiveInt(NBTBase, int, metaclass=AbstractClass):
 
     @classmethod
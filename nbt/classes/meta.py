@@ -1,11 +1,13 @@
-from typing import BinaryIO, Dict, List
+from typing import BinaryIO, Dict, Iterable, List, Tuple
 
-from nbt.classes.base import NBTBase
+from nbt.classes.base import NBTBase, NBTMutable, DICT_MUTATORS, MIN_PAYLOAD_SIZES, SORTED_LIST_MUTATORS, \
+    _track_mutations
 
 import re
 
 
-class NBTTagList(NBTBase, List[NBTBase]):
+@_track_mutations(SORTED_LIST_MUTATORS)
+class NBTTagList(NBTMutable, List[NBTBase]):
 
     def write(self, data_stream: BinaryIO) -> None:
         size: int = len(self)
@@ -19,22 +21,30 @@ class NBTTagList(NBTBase, List[NBTBase]):
         for tag in self:
             tag.write(data_stream)
 
+    def write_canonical(self, data_stream: BinaryIO) -> None:
+        self._write(data_stream, 'B', self[0].id() if self else 0)
+        self._write(data_stream, 'i', len(self))
+
+        for tag in self:
+            tag.write_canonical(data_stream)
+
+    def _digest_children(self) -> Iterable[Tuple[bytes, NBTBase]]:
+        return ((b'', tag) for tag in self)
+
+    def _digest_payload(self) -> bytes:
+        return bytes((self[0].id() if self else 0,))
+
     @classmethod
     def read(cls, data_stream: BinaryIO, depth: int) -> 'NBTBase':
         if depth > 512:
             raise RuntimeError("Tried to read NBT tag with too high complexity, depth > 512")
 
         tag_type: int = cls._read(data_stream, 'B')
-        size: int = cls._read(data_stream, 'i')
+        size: int = cls._read_length(data_stream, 'list', MIN_PAYLOAD_SIZES.get(tag_type, 0))
         if tag_type == 0 and size > 0:
             raise RuntimeError("Missing type on ListTag")
 
-        tag_list = NBTTagList()
-
-        for i in range(size):
-            tag_list.append(NBTBase.read_in(tag_type, data_stream, depth + 1))
-
-        return tag_list
+        return NBTTagList([NBTBase.read_in(tag_type, data_stream, depth + 1) for _ in range(size)])
 
     @classmethod
     def id(cls) -> int:
@@ -47,7 +57,8 @@ class NBTTagList(NBTBase, List[NBTBase]):
         return "[" + ",".join(map(str, self)) + "]"
 
 
-class NBTTagCompound(NBTBase, Dict[str, NBTBase]):
+@_track_mutations(DICT_MUTATORS)
+class NBTTagCompound(NBTMutable, Dict[str, NBTBase]):
 
     def write(self, data_stream: BinaryIO) -> None:
         for key in self.keys():
@@ -57,12 +68,25 @@ class NBTTagCompound(NBTBase, Dict[str, NBTBase]):
             tag.write(data_stream)
         self._write(data_stream, 'B', 0)
 
+    def write_canonical(self, data_stream: BinaryIO) -> None:
+        for key in sorted(self.keys()):
+            tag = self[key]
+            self._write(data_stream, 'B', tag.id())
+            self._write_utf8(data_stream, key)
+            tag.write_canonical(data_stream)
+        self._write(data_stream, 'B', 0)
+
+    def _digest_children(self) -> Iterable[Tuple[bytes, NBTBase]]:
+        for key in sorted(self.keys()):
+            encoded = key.encode('utf-8', 'surrogatepass')
+            yield len(encoded).to_bytes(4, 'big') + encoded, self[key]
+
     @classmethod
     def read(cls, data_stream: BinaryIO, depth: int) -> 'NBTBase':
         if depth > 512:
             raise RuntimeError("Tried to read NBT tag with too high complexity, depth > 512")
 
-        compound = NBTTagCompound()
+        entries: Dict[str, NBTBase] = {}
 
         tag_type: int = -1
         while tag_type != 0:
@@ -70,16 +94,16 @@ class NBTTagCompound(NBTBase, Dict[str, NBTBase]):
             if tag_type == 0:
                 break
             key: str = cls._read_utf8(data_stream)
-            compound[key] = cls.read_in(tag_type, data_stream, depth + 1)
+            entries[key] = cls.read_in(tag_type, data_stream, depth + 1)
 
-        return compound
+        return NBTTagCompound(entries)
 
     @classmethod
     def id(cls) -> int:
         return 10
 
     def copy(self) -> 'NBTBase':
-        return NBTTagCompound({key: tag.copy() for (key, tag) in self})
+        return NBTTagCompound({key: tag.copy() for (key, tag) in self.items()})
 
     KEY_PATTERN = re.compile("[A-Za-z0-9._+-]+")
 
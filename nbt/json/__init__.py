@@ -1,5 +1,9 @@
+from nbt.json.decoder import from_json
+from nbt.json.encoder import to_json
 from nbt.json.reader import NBTReader
 
 __all__ = [
-    'NBTReader'
+    'NBTReader',
+    'from_json',
+    'to_json'
 ]
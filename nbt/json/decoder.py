@@ -0,0 +1,162 @@
+import json
+from typing import Dict, List, Optional, TextIO, Union
+
+from nbt.classes import *
+from nbt.json.types import TYPE_CLASSES
+from nbt.path import Path, WILDCARD, format_path, parse_path
+
+INT_RANGE = range(-2 ** 31, 2 ** 31)
+
+# Accepted JSON integers per integral tag type; byte arrays take both signed and unsigned bytes
+INTEGER_RANGES: Dict[str, range] = {
+    'byte': range(-2 ** 7, 2 ** 7),
+    'short': range(-2 ** 15, 2 ** 15),
+    'int': INT_RANGE,
+    'long': range(-2 ** 63, 2 ** 63),
+    'byte_array': range(-2 ** 7, 2 ** 8),
+    'int_array': INT_RANGE,
+    'long_array': range(-2 ** 63, 2 ** 63)
+}
+
+# Typed JSON spells non-finite floats as strings, since JSON has no literal for them
+NON_FINITE = {'NaN': float('nan'), 'Infinity': float('inf'), '-Infinity': float('-inf')}
+
+
+class _SchemaNode:
+
+    def __init__(self):
+        self.type: Optional[str] = None
+        self.children: Dict[str, '_SchemaNode'] = {}
+
+
+def _compile_schema(schema: Dict[Path, str]) -> _SchemaNode:
+    root = _SchemaNode()
+    for (path, type_name) in schema.items():
+        if type_name not in TYPE_CLASSES:
+            raise ValueError("Unknown tag type '" + type_name + "' for " + format_path(path))
+        node = root
+        for segment in parse_path(path):
+            node = node.children.setdefault(str(segment), _SchemaNode())
+        node.type = type_name
+    return root
+
+
+def _plain_type(value, node: Optional[_SchemaNode]) -> str:
+    if node is not None and node.type is not None:
+        return node.type
+    elif isinstance(value, bool):
+        return 'byte'
+    elif isinstance(value, int):
+        return 'int' if value in INT_RANGE else 'long'
+    elif isinstance(value, float):
+        return 'double'
+    elif isinstance(value, str):
+        return 'string'
+    elif isinstance(value, list):
+        return 'list'
+    elif isinstance(value, dict):
+        return 'compound'
+    raise RuntimeError("Cannot convert " + type(value).__name__ + " to NBT")
+
+
+def _mismatch(type_name: str, value) -> RuntimeError:
+    return RuntimeError("Expected a " + type_name + " value but got " + json.dumps(value)[:64])
+
+
+def _integer(type_name: str, value) -> int:
+    if type(value) is not int or value not in INTEGER_RANGES[type_name]:
+        raise _mismatch(type_name, value)
+    return value
+
+
+def _leaf(type_name: str, value, typed: bool) -> NBTBase:
+    if type_name in ('float', 'double'):
+        if typed and isinstance(value, str) and value in NON_FINITE:
+            value = NON_FINITE[value]
+        elif type(value) not in (int, float):
+            raise _mismatch(type_name, value)
+    elif type_name == 'string':
+        if not isinstance(value, str):
+            raise _mismatch(type_name, value)
+    elif type_name in ('byte_array', 'int_array', 'long_array'):
+        bounds = INTEGER_RANGES[type_name]
+        if not isinstance(value, list) or \
+                value and (set(map(type, value)) != {int} or min(value) not in bounds or max(value) not in bounds):
+            raise _mismatch(type_name, value)
+        if type_name == 'byte_array':
+            value = [byte & 0xFF for byte in value]
+    elif not (type_name == 'byte' and not typed and isinstance(value, bool)):
+        value = _integer(type_name, value)
+    return TYPE_CLASSES[type_name](value)
+
+
+def _check_list(tags: List[NBTBase]) -> NBTTagList:
+    for tag in tags:
+        if type(tag) is not type(tags[0]):
+            raise RuntimeError("Unable to insert " + type(tag).__name__ + " into ListTag of type " +
+                               type(tags[0]).__name__)
+    return NBTTagList(tags)
+
+
+def _compound_items(value: dict, node: Optional[_SchemaNode]):
+    children = node.children if node is not None else {}
+    return ((name, child, children.get(name)) for (name, child) in value.items())
+
+
+def _list_items(value: list, node: Optional[_SchemaNode]):
+    element = node.children.get(WILDCARD) if node is not None else None
+    return ((None, child, element) for child in value)
+
+
+def _decode(value, typed: bool, schema: Optional[_SchemaNode]) -> NBTBase:
+    root: List[NBTBase] = []
+    # Frames are [iterator over (key, value, schema node), collected children, parent's collection, key, type]
+    stack: List[list] = [[iter(((None, value, schema),)), root, None, None, None]]
+    while stack:
+        frame = stack[-1]
+        item = next(frame[0], None)
+        if item is None:
+            stack.pop()
+            if frame[4] == 'compound':
+                tag = NBTTagCompound(frame[1])
+            elif frame[4] == 'list':
+                tag = _check_list(frame[1])
+            else:
+                continue
+            if frame[3] is None:
+                frame[2].append(tag)
+            else:
+                frame[2][frame[3]] = tag
+            continue
+
+        key, value, node = item
+        if typed:
+            if not isinstance(value, dict) or value.get('type') not in TYPE_CLASSES or 'value' not in value:
+                raise RuntimeError("Expected a typed value but got " + json.dumps(value)[:64])
+            type_name, value = value['type'], value['value']
+        else:
+            type_name = _plain_type(value, node)
+
+        if type_name == 'compound':
+            if not isinstance(value, dict):
+                raise RuntimeError("Expected an object for a compound but got " + type(value).__name__)
+            stack.append([_compound_items(value, node), {}, frame[1], key, type_name])
+        elif type_name == 'list':
+            if not isinstance(value, list):
+                raise RuntimeError("Expected an array for a list but got " + type(value).__name__)
+            stack.append([_list_items(value, node), [], frame[1], key, type_name])
+        else:
+            tag = _leaf(type_name, value, typed)
+            if key is None:
+                frame[1].append(tag)
+            else:
+                frame[1][key] = tag
+
+    return root[0]
+
+
+def from_json(data: Union[str, TextIO], typed: bool = True, schema: Optional[Dict[Path, str]] = None) -> NBTBase:
+    if typed and schema is not None:
+        raise ValueError("A schema only applies to plain JSON; pass typed=False")
+    value = json.loads(data) if isinstance(data, str) else json.load(data)
+    return _decode(value, typed, None if schema is None else _compile_schema(schema))
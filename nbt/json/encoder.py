@@ -0,0 +1,108 @@
+import io
+import re
+from json.encoder import encode_basestring
+from typing import Callable, List, Optional, TextIO
+
+from nbt.classes import *
+from nbt.json.types import TYPE_NAMES
+
+FLUSH_PARTS = 4096
+
+# Byte arrays hold unsigned bytes, but NBT bytes are signed everywhere else
+SIGNED_BYTES = tuple(str(byte - 256 if byte > 127 else byte) for byte in range(256))
+
+# NBT strings can hold lone surrogates, which no UTF encoding of the JSON text could carry unescaped
+SURROGATES = re.compile('[\ud800-\udfff]')
+
+
+def _escape_surrogate(match: 're.Match') -> str:
+    return '\\u' + format(ord(match.group()), '04x')
+
+
+def _escape_surrogates(text: str) -> str:
+    # Everything outside string literals is ASCII, so whole chunks of output can be escaped at once. Encoding fails
+    # exactly when there is a surrogate to escape, and is cheaper than searching for one.
+    if text.isascii():
+        return text
+    try:
+        text.encode('utf-8')
+        return text
+    except UnicodeEncodeError:
+        return SURROGATES.sub(_escape_surrogate, text)
+
+
+def _encode_float(value: float, typed: bool) -> str:
+    if value != value:
+        text = 'NaN'
+    elif value == float('inf'):
+        text = 'Infinity'
+    elif value == -float('inf'):
+        text = '-Infinity'
+    else:
+        return float.__repr__(value)
+    # JSON has no literal for non-finite numbers; typed output can spell them as strings
+    if not typed:
+        raise RuntimeError("Cannot encode " + text + " as plain JSON; use typed=True")
+    return '"' + text + '"'
+
+
+def _encode_scalar(tag: NBTBase, tag_id: int, typed: bool) -> str:
+    if tag_id <= 4:
+        return int.__repr__(tag)
+    elif tag_id <= 6:
+        return _encode_float(tag, typed)
+    elif tag_id == 8:
+        return encode_basestring(tag)
+    elif tag_id == 7:
+        return '[' + ','.join([SIGNED_BYTES[byte] for byte in tag]) + ']'
+    return '[' + ','.join(map(str, tag)) + ']'
+
+
+def _encode(tag: NBTBase, write: Callable[[str], object], typed: bool) -> None:
+    out: List[str] = []
+    # Frames are [iterator over (key, tag), closing text, items written so far]
+    stack: List[list] = [[iter(((None, tag),)), '', 0]]
+    while stack:
+        frame = stack[-1]
+        item = next(frame[0], None)
+        if item is None:
+            stack.pop()
+            out.append(frame[1])
+            continue
+
+        key, value = item
+        if frame[2]:
+            out.append(',')
+        frame[2] += 1
+        if key is not None:
+            out.append(encode_basestring(key))
+            out.append(':')
+
+        tag_id: int = value.id()
+        if typed:
+            out.append('{"type":"' + TYPE_NAMES[tag_id] + '","value":')
+        if tag_id == 10:
+            out.append('{')
+            stack.append([iter(value.items()), '}}' if typed else '}', 0])
+        elif tag_id == 9:
+            out.append('[')
+            stack.append([((None, element) for element in value), ']}' if typed else ']', 0])
+        else:
+            out.append(_encode_scalar(value, tag_id, typed))
+            if typed:
+                out.append('}')
+
+        if len(out) > FLUSH_PARTS:
+            write(_escape_surrogates(''.join(out)))
+            out.clear()
+
+    write(_escape_surrogates(''.join(out)))
+
+
+def to_json(tag: NBTBase, stream: Optional[TextIO] = None, typed: bool = True) -> Optional[str]:
+    if stream is not None:
+        _encode(tag, stream.write, typed)
+        return None
+    buffer = io.StringIO()
+    _encode(tag, buffer.write, typed)
+    return buffer.getvalue()
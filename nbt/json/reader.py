@@ -1,5 +1,5 @@
 import re
-from typing import NoReturn, Type, Iterable, List, Optional
+from typing import Dict, NoReturn, Type, Iterable, List, Optional
 
 from nbt.classes import *
 
@@ -158,7 +158,7 @@ class NBTReader:
         if not self._can_read():
             self._throw("Expected value")
         else:
-            tags = NBTTagList()
+            tags: List[NBTBase] = []
             tag_type: Optional[Type[NBTBase]] = None
             while self._peek() != ']':
                 nbt = self._read_value()
@@ -172,7 +172,7 @@ class NBTReader:
                 elif not self._can_read():
                     self._throw("Expected value")
             self._expect(']')
-            return tags
+            return NBTTagList(tags)
 
     def _read_array(self) -> NBTBase:
         self._expect('[')
@@ -208,7 +208,7 @@ class NBTReader:
 
     def read_compound(self) -> NBTTagCompound:
         self._expect('{')
-        compound = NBTTagCompound()
+        compound: Dict[str, NBTBase] = {}
         self._skip_whitespace()
         while self._can_read() and self._peek() != '}':
             key = self._read_key()
@@ -221,7 +221,7 @@ class NBTReader:
             elif not self._can_read():
                 self._throw("Expected key")
         self._expect('}')
-        return compound
+        return NBTTagCompound(compound)
 
     @staticmethod
     def read(data: str) -> NBTTagCompound:
@@ -0,0 +1,33 @@
+from typing import Dict, Type
+
+from nbt.classes import *
+
+TYPE_NAMES: Dict[int, str] = {
+    1: 'byte',
+    2: 'short',
+    3: 'int',
+    4: 'long',
+    5: 'float',
+    6: 'double',
+    7: 'byte_array',
+    8: 'string',
+    9: 'list',
+    10: 'compound',
+    11: 'int_array',
+    12: 'long_array'
+}
+
+TYPE_CLASSES: Dict[str, Type[NBTBase]] = {
+    'byte': NBTTagByte,
+    'short': NBTTagShort,
+    'int': NBTTagInt,
+    'long': NBTTagLong,
+    'float': NBTTagFloat,
+    'double': NBTTagDouble,
+    'byte_array': NBTTagByteArray,
+    'string': NBTTagString,
+    'list': NBTTagList,
+    'compound': NBTTagCompound,
+    'int_array': NBTTagIntArray,
+    'long_array': NBTTagLongArray
+}
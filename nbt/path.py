@@ -0,0 +1,52 @@
+from typing import List, Sequence, Tuple, Union
+
+from nbt.classes import *
+
+Segment = Union[str, int]
+Path = Union[str, Sequence[Segment]]
+
+WILDCARD = '*'
+
+ARRAY_TYPES = (NBTTagList, NBTTagByteArray, NBTTagIntArray, NBTTagLongArray,
+               NBTTagByteArrayView, NBTTagIntArrayView, NBTTagLongArrayView)
+
+
+def parse_path(path: Path) -> Tuple[Segment, ...]:
+    if not isinstance(path, str):
+        return tuple(path)
+    if not path:
+        return ()
+    return tuple(int(segment) if segment.isdigit() else segment for segment in path.split('.'))
+
+
+def format_path(path: Path) -> str:
+    return '.'.join(map(str, parse_path(path)))
+
+
+def resolve(tag: NBTBase, path: Path) -> List[NBTBase]:
+    found: List[NBTBase] = [tag]
+    for segment in parse_path(path):
+        matched: List[NBTBase] = []
+        for current in found:
+            if isinstance(current, NBTTagCompound):
+                if segment == WILDCARD:
+                    matched.extend(current.values())
+                elif str(segment) in current:
+                    matched.append(current[str(segment)])
+            elif isinstance(current, ARRAY_TYPES):
+                if segment == WILDCARD:
+                    matched.extend(_element(current, i) for i in range(len(current)))
+                elif isinstance(segment, int) and -len(current) <= segment < len(current):
+                    matched.append(_element(current, segment))
+        found = matched
+    return found
+
+
+def _element(array: NBTBase, index: int) -> NBTBase:
+    if isinstance(array, (NBTTagByteArray, NBTTagByteArrayView)):
+        return NBTTagByte(array[index] - 256 if array[index] > 127 else array[index])
+    elif isinstance(array, (NBTTagIntArray, NBTTagIntArrayView)):
+        return NBTTagInt(array[index])
+    elif isinstance(array, (NBTTagLongArray, NBTTagLongArrayView)):
+        return NBTTagLong(array[index])
+    return array[index]
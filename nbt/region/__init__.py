@@ -0,0 +1,7 @@
+from nbt.region.index import RegionIndex
+from nbt.region.region import RegionFile
+
+__all__ = [
+    'RegionFile',
+    'RegionIndex'
+]
@@ -0,0 +1,129 @@
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+import nbt
+from nbt.classes import *
+from nbt.path import Path, format_path, parse_path, resolve
+from nbt.region.region import RegionFile
+
+INDEX_VERSION = 2
+
+ChunkValues = Dict[str, List[NBTBase]]
+
+ENTRY_KEYS = ("x", "z", "Offset", "Sectors", "Timestamp")
+
+
+def _in_order(tags: NBTTagCompound) -> List[NBTBase]:
+    return [tags[key] for key in sorted(tags, key=int)]
+
+
+class RegionIndex:
+
+    def __init__(self, region: str, fields: Dict[str, Path], location: Optional[str] = None):
+        self.region: str = region
+        self.location: str = location or region + ".idx"
+        self.fields: Dict[str, Tuple] = {name: parse_path(path) for (name, path) in fields.items()}
+        self._entries: Dict[Tuple[int, int], NBTTagCompound] = {}
+        # Whether the sidecar on disk holds the current entries for the current field set
+        self._saved: bool = False
+
+        if os.path.exists(self.location):
+            self._load()
+
+    def _field_tags(self) -> NBTTagCompound:
+        return NBTTagCompound({name: NBTTagString(format_path(path)) for (name, path) in self.fields.items()})
+
+    def _load(self) -> None:
+        # A sidecar that cannot be read is only a cache; drop it and let the next update rebuild it
+        try:
+            stored = nbt.read_zipped(self.location)
+        except Exception:
+            return
+        if not isinstance(stored, NBTTagCompound) or stored.get("Version") != INDEX_VERSION:
+            return
+        # Entries extracted with a different field set cannot answer the current queries
+        if stored.get("Fields") != self._field_tags():
+            return
+
+        entries = {}
+        for entry in stored.get("Chunks", ()):
+            if not isinstance(entry, NBTTagCompound) or not isinstance(entry.get("Values"), NBTTagCompound) or \
+                    any(not isinstance(entry["Values"].get(name), NBTTagCompound) for name in self.fields) or \
+                    any(not isinstance(entry.get(key), NBTTagInt) for key in ENTRY_KEYS):
+                return
+            entries[(int(entry["x"]), int(entry["z"]))] = entry
+        self._entries = entries
+        self._saved = True
+
+    def save(self) -> None:
+        index = NBTTagCompound()
+        index["Version"] = NBTTagInt(INDEX_VERSION)
+        index["Fields"] = self._field_tags()
+        index["Chunks"] = NBTTagList(self._entries.values())
+        nbt.write_zipped(index, self.location)
+        self._saved = True
+
+    def _extract(self, chunk: NBTBase) -> NBTTagCompound:
+        values = NBTTagCompound()
+        for (name, path) in self.fields.items():
+            # A wildcard can match tags of different types, which a list cannot hold; key them by position instead
+            values[name] = NBTTagCompound({str(index): tag.copy() for (index, tag) in enumerate(resolve(chunk, path))})
+        return values
+
+    def update(self) -> int:
+        region = RegionFile(self.region)
+        seen = set()
+        reread: int = 0
+
+        with open(self.region, 'rb') as stream:
+            for (x, z) in region.chunks():
+                seen.add((x, z))
+                offset, sectors = region.chunk_location(x, z)
+                timestamp = region.timestamp(x, z)
+
+                entry = self._entries.get((x, z))
+                if entry is not None and entry["Offset"] == offset and entry["Sectors"] == sectors \
+                        and entry["Timestamp"] == timestamp:
+                    continue
+
+                entry = NBTTagCompound()
+                entry["x"] = NBTTagInt(x)
+                entry["z"] = NBTTagInt(z)
+                entry["Offset"] = NBTTagInt(offset)
+                entry["Sectors"] = NBTTagInt(sectors)
+                entry["Timestamp"] = NBTTagInt(timestamp)
+                entry["Values"] = self._extract(region.read_chunk(x, z, stream))
+                self._entries[(x, z)] = entry
+                reread += 1
+
+        removed = [key for key in self._entries if key not in seen]
+        for key in removed:
+            del self._entries[key]
+
+        if reread or removed or not self._saved:
+            self.save()
+        return reread
+
+    def chunks(self) -> List[Tuple[int, int]]:
+        return sorted(self._entries)
+
+    def timestamp(self, x: int, z: int) -> Optional[int]:
+        entry = self._entries.get((x & 31, z & 31))
+        return None if entry is None else int(entry["Timestamp"])
+
+    def values(self, x: int, z: int) -> Optional[ChunkValues]:
+        entry = self._entries.get((x & 31, z & 31))
+        if entry is None:
+            return None
+        return {name: _in_order(tags) for (name, tags) in entry["Values"].items()}
+
+    def query(self, predicate: Callable[[ChunkValues], bool]) -> List[Tuple[int, int]]:
+        return [key for key in self.chunks() if predicate(self.values(*key))]
+
+    def find(self, field: str, value) -> List[Tuple[int, int]]:
+        if field not in self.fields:
+            raise KeyError("Field " + field + " is not indexed")
+        return [key for key in self.chunks() if value in self._entries[key]["Values"][field].values()]
+
+    def modified_after(self, timestamp: int) -> List[Tuple[int, int]]:
+        return [key for key in self.chunks() if self._entries[key]["Timestamp"] > timestamp]
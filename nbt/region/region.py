@@ -0,0 +1,80 @@
+import gzip
+import io
+import struct
+import zlib
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from nbt.classes import *
+from nbt.stream import NBTBudget
+
+SECTOR_SIZE = 4096
+CHUNKS_PER_REGION = 1024
+
+COMPRESSION_GZIP = 1
+COMPRESSION_ZLIB = 2
+COMPRESSION_NONE = 3
+
+
+class RegionFile:
+
+    def __init__(self, location: str):
+        self.location: str = location
+        with open(location, 'rb') as stream:
+            header: bytes = stream.read(2 * SECTOR_SIZE)
+        if len(header) < 2 * SECTOR_SIZE:
+            header += bytes(2 * SECTOR_SIZE - len(header))
+
+        self._locations: Tuple[int, ...] = struct.unpack_from("!1024I", header, 0)
+        self._timestamps: Tuple[int, ...] = struct.unpack_from("!1024i", header, SECTOR_SIZE)
+
+    @staticmethod
+    def _slot(x: int, z: int) -> int:
+        return (x & 31) + (z & 31) * 32
+
+    def chunk_location(self, x: int, z: int) -> Tuple[int, int]:
+        packed = self._locations[self._slot(x, z)]
+        return packed >> 8, packed & 0xFF
+
+    def timestamp(self, x: int, z: int) -> int:
+        return self._timestamps[self._slot(x, z)]
+
+    def has_chunk(self, x: int, z: int) -> bool:
+        return self._locations[self._slot(x, z)] != 0
+
+    def chunks(self) -> Iterator[Tuple[int, int]]:
+        for slot in range(CHUNKS_PER_REGION):
+            if self._locations[slot] != 0:
+                yield slot & 31, slot >> 5
+
+    def read_chunk_bytes(self, x: int, z: int, stream: Optional[BinaryIO] = None) -> Optional[bytes]:
+        offset, sectors = self.chunk_location(x, z)
+        if offset == 0:
+            return None
+
+        if stream is None:
+            with open(self.location, 'rb') as stream:
+                return self.read_chunk_bytes(x, z, stream)
+
+        stream.seek(offset * SECTOR_SIZE)
+        length, compression = struct.unpack("!iB", stream.read(5))
+        if length <= 0 or length + 4 > sectors * SECTOR_SIZE:
+            raise RuntimeError("Chunk " + str(x) + "," + str(z) + " has invalid length " + str(length))
+
+        data: bytes = stream.read(length - 1)
+        if compression == COMPRESSION_GZIP:
+            return gzip.decompress(data)
+        elif compression == COMPRESSION_ZLIB:
+            return zlib.decompress(data)
+        elif compression == COMPRESSION_NONE:
+            return data
+        raise RuntimeError("Chunk " + str(x) + "," + str(z) + " has unknown compression " + str(compression))
+
+    def read_chunk(self, x: int, z: int, stream: Optional[BinaryIO] = None,
+                   budget: Optional[NBTBudget] = None) -> Optional[NBTBase]:
+        data = self.read_chunk_bytes(x, z, stream)
+        if data is None:
+            return None
+        return NBTBase.read_new_tag(io.BytesIO(data), budget)
+
+    def __repr__(self) -> str:
+        return "RegionFile(" + repr(self.location) + ")"
@@ -0,0 +1,9 @@
+from nbt.stream.budget import BudgetedStream, NBTBudget, NBTLimitError
+from nbt.stream.mapped import MappedStream
+
+__all__ = [
+    'BudgetedStream',
+    'MappedStream',
+    'NBTBudget',
+    'NBTLimitError'
+]
@@ -0,0 +1,84 @@
+import io
+import os
+from typing import BinaryIO, Optional
+
+from nbt.stream.mapped import MappedStream
+
+
+class NBTLimitError(RuntimeError):
+    pass
+
+
+class NBTBudget:
+
+    def __init__(self, max_bytes: Optional[int] = None, max_tags: Optional[int] = None,
+                 max_array_length: Optional[int] = None, max_string_length: Optional[int] = None):
+        self.max_bytes: Optional[int] = max_bytes
+        self.max_tags: Optional[int] = max_tags
+        self.max_array_length: Optional[int] = max_array_length
+        self.max_string_length: Optional[int] = max_string_length
+
+
+class BudgetedStream:
+
+    def __init__(self, stream: BinaryIO, budget: NBTBudget):
+        self.stream: BinaryIO = stream
+        self.budget: NBTBudget = budget
+        self.bytes_read: int = 0
+        self.tags_read: int = 0
+        self.available: Optional[int] = self._available(stream)
+
+    @staticmethod
+    def _available(stream: BinaryIO) -> Optional[int]:
+        # Only ask for the size where it is cheap; seeking to the end of a GzipFile would decompress everything
+        if isinstance(stream, MappedStream):
+            return len(stream) - stream.tell()
+        elif isinstance(stream, io.BytesIO):
+            return len(stream.getbuffer()) - stream.tell()
+        elif isinstance(stream, (io.BufferedReader, io.FileIO)):
+            return os.fstat(stream.fileno()).st_size - stream.tell()
+        return None
+
+    def remaining(self) -> Optional[int]:
+        remaining: Optional[int] = None
+        if self.available is not None:
+            remaining = self.available - self.bytes_read
+        if self.budget.max_bytes is not None:
+            allowed = self.budget.max_bytes - self.bytes_read
+            remaining = allowed if remaining is None else min(remaining, allowed)
+        return remaining
+
+    def read(self, size: int = -1):
+        if size is None or size < 0:
+            size = self.remaining()
+            if size is None:
+                raise NBTLimitError("Refusing to read an unbounded amount of data")
+        remaining = self.remaining()
+        if remaining is not None and size > remaining:
+            raise NBTLimitError("Tried to read " + str(size) + " bytes with only " + str(remaining) + " remaining")
+        data = self.stream.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def count_tag(self) -> None:
+        self.tags_read += 1
+        if self.budget.max_tags is not None and self.tags_read > self.budget.max_tags:
+            raise NBTLimitError("Tag count exceeds limit of " + str(self.budget.max_tags))
+
+    def check_length(self, kind: str, length: int, element_size: int) -> None:
+        if kind == 'string':
+            limit = self.budget.max_string_length
+        elif kind == 'list':
+            limit = None if self.budget.max_tags is None else self.budget.max_tags - self.tags_read
+        else:
+            limit = self.budget.max_array_length
+        if limit is not None and length > limit:
+            raise NBTLimitError(kind.capitalize() + " length " + str(length) + " exceeds limit of " + str(limit))
+
+        remaining = self.remaining()
+        if remaining is not None and length * element_size > remaining:
+            raise NBTLimitError(kind.capitalize() + " of length " + str(length) + " needs at least " +
+                                str(length * element_size) + " bytes but only " + str(remaining) + " remain")
+
+    def __getattr__(self, name: str):
+        return getattr(self.stream, name)
@@ -0,0 +1,40 @@
+import io
+
+
+class MappedStream:
+
+    zero_copy = True
+
+    def __init__(self, buffer):
+        self.buffer: memoryview = memoryview(buffer).cast('B').toreadonly()
+        self.position: int = 0
+
+    def read(self, size: int = -1) -> memoryview:
+        start = self.position
+        if size is None or size < 0:
+            self.position = len(self.buffer)
+        else:
+            self.position = min(start + size, len(self.buffer))
+        return self.buffer[start:self.position]
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.buffer)
+        if offset < 0:
+            raise ValueError("Negative seek position " + str(offset))
+        self.position = offset
+        return offset
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def __len__(self) -> int:
+        return len(self.buffer)
@@ -0,0 +1,62 @@
+import gzip
+import io
+import struct
+
+import pytest
+
+import nbt
+from nbt import NBTBase, NBTBudget, NBTLimitError, NBTTagCompound, NBTTagIntArray, NBTTagList, NBTTagString
+
+
+def _encode(tag: NBTBase) -> bytes:
+    stream = io.BytesIO()
+    tag.write_out(stream)
+    return stream.getvalue()
+
+
+SAMPLE = NBTTagCompound({
+    'ints': NBTTagIntArray(range(64)),
+    'names': NBTTagList(NBTTagString('name' + str(i)) for i in range(8))
+})
+
+
+def test_within_budget():
+    data = _encode(SAMPLE)
+    budget = NBTBudget(max_bytes=len(data), max_tags=11, max_array_length=64, max_string_length=5)
+    assert NBTBase.read_new_tag(io.BytesIO(data), budget) == SAMPLE
+
+
+@pytest.mark.parametrize("budget", [
+    NBTBudget(max_bytes=100),
+    NBTBudget(max_tags=5),
+    NBTBudget(max_array_length=63),
+    NBTBudget(max_string_length=4)
+])
+def test_budget_exceeded(budget):
+    with pytest.raises(NBTLimitError):
+        NBTBase.read_new_tag(io.BytesIO(_encode(SAMPLE)), budget)
+
+
+@pytest.mark.parametrize("payload", [
+    b'\x09\x00\x01L\x0a' + struct.pack('!i', 2 ** 31 - 1),
+    b'\x0c\x00\x01L' + struct.pack('!i', 2 ** 31 - 1),
+    b'\x07\x00\x01B' + struct.pack('!i', 2 ** 31 - 1)
+])
+def test_hostile_lengths_fail_before_allocating(payload):
+    with pytest.raises(NBTLimitError):
+        NBTBase.read_new_tag(io.BytesIO(b'\x0a\x00\x00' + payload), NBTBudget())
+
+
+def test_negative_length():
+    with pytest.raises(RuntimeError):
+        NBTBase.read_new_tag(io.BytesIO(b'\x0a\x00\x00\x07\x00\x01B' + struct.pack('!i', -1) + b'\x00'))
+
+
+@pytest.mark.parametrize("cut", [1, 5, 20, 100])
+def test_truncated_input(tmp_path, cut):
+    location = tmp_path / 'truncated.nbt.gz'
+    location.write_bytes(gzip.compress(_encode(SAMPLE)[:-cut]))
+    with pytest.raises(RuntimeError):
+        nbt.read_zipped(str(location), NBTBudget(max_tags=1000))
+    with pytest.raises(RuntimeError):
+        nbt.read_zipped(str(location))
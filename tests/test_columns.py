@@ -0,0 +1,73 @@
+import io
+from struct import pack
+
+import pytest
+
+from nbt import NBTBase, NBTTagByte, NBTTagCompound, NBTTagDouble, NBTTagInt, NBTTagIntArray, NBTTagList, \
+    NBTTagString, extract_columns
+from nbt.binary import ColumnBatch
+
+
+def _encode(tag: NBTBase) -> bytes:
+    stream = io.BytesIO()
+    tag.write_out(stream)
+    return stream.getvalue()
+
+
+def _record(i: int) -> NBTTagCompound:
+    record = NBTTagCompound({
+        'id': NBTTagString('entity' + str(i)),
+        'Pos': NBTTagList([NBTTagDouble(i), NBTTagDouble(-i), NBTTagDouble(0.5)]),
+        'UUID': NBTTagIntArray([i, i + 1, i + 2, i + 3]),
+        'Items': NBTTagList([NBTTagCompound({'Count': NBTTagByte(i % 64)})])
+    })
+    if i % 2:
+        record['Health'] = NBTTagInt(i)
+    return record
+
+
+FIELDS = {'id': 'id', 'x': 'Pos.0', 'uuid': 'UUID.1', 'count': 'Items.0.Count', 'health': 'Health'}
+
+
+def test_extract_columns():
+    batch = extract_columns(FIELDS, [_encode(_record(i)) for i in range(10)])
+    assert batch.rows == 10
+    assert batch.columns['id'].to_list() == ['entity' + str(i) for i in range(10)]
+    assert batch.columns['x'].to_list() == [float(i) for i in range(10)]
+    assert batch.columns['uuid'].to_list() == [i + 1 for i in range(10)]
+    assert batch.columns['count'].to_list() == list(range(10))
+    assert batch.columns['health'].to_list() == [i if i % 2 else None for i in range(10)]
+
+
+@pytest.mark.parametrize("record", [
+    b'\x0a\x00\x00\x0b\x00\x01U' + pack('!i', -2) + b'\x00',
+    b'\x0a\x00\x00\x09\x00\x01U\x03' + pack('!i', -2) + b'\x00',
+    b'\x0a\x00\x00\x09\x00\x01U\x0a' + pack('!i', -2) + b'\x00',
+    b'\x0a\x00\x00\x0b\x00\x01U' + pack('!i', 1000) + b'\x00',
+])
+def test_hostile_lengths(record):
+    batch = ColumnBatch({'u': 'U.0'})
+    with pytest.raises(RuntimeError):
+        batch.add(record)
+    assert batch.rows == 0 and len(batch.columns['u']) == 0
+
+
+@pytest.mark.parametrize("cut", range(1, 40, 3))
+def test_truncated_records(cut):
+    data = _encode(_record(1))
+    batch = ColumnBatch(FIELDS)
+    batch.add(data)
+    with pytest.raises(RuntimeError):
+        batch.add(data[:-cut])
+    batch.add(data)
+    assert batch.rows == 2
+    assert all(len(column) == 2 for column in batch.columns.values())
+    assert batch.columns['id'].to_list() == ['entity1', 'entity1']
+
+
+def test_repeated_key_keeps_last_value():
+    repeated = b'\x0a\x00\x00\x03\x00\x01a' + pack('!i', 1) + b'\x03\x00\x01a' + pack('!i', 2) + b'\x00'
+    batch = extract_columns({'a': 'a'}, [repeated, _encode(NBTTagCompound({'a': NBTTagInt(3)}))])
+    assert batch.rows == 2 and len(batch.columns['a']) == 2
+    assert batch.columns['a'].to_list() == [2, 3]
+    assert NBTBase.read_new_tag(io.BytesIO(repeated))['a'] == 2
@@ -0,0 +1,171 @@
+import copy
+import gc
+import io
+import pickle
+from struct import pack
+
+import pytest
+
+import nbt
+from nbt import NBTBase, NBTTagByteArray, NBTTagByteArrayView, NBTTagCompound, NBTTagInt, NBTTagIntArray, \
+    NBTTagIntArrayView, NBTTagList, NBTTagLong, NBTTagLongArray, NBTTagString
+
+
+def _sample() -> NBTTagCompound:
+    return NBTTagCompound({
+        'name': NBTTagString('Steve'),
+        'bytes': NBTTagByteArray(b'\x01\x02'),
+        'ints': NBTTagIntArray([1, 2, 3]),
+        'Inventory': NBTTagList([NBTTagCompound({'Count': NBTTagInt(1)})])
+    })
+
+
+def _encode(tag: NBTBase) -> bytes:
+    stream = io.BytesIO()
+    tag.write_out(stream)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize('protocol', range(2, pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle_after_digest(protocol):
+    tag = _sample()
+    digest = tag.digest()
+    loaded = pickle.loads(pickle.dumps(tag, protocol))
+    assert loaded == tag and type(loaded['bytes']) is NBTTagByteArray
+    assert loaded.digest() == digest
+    loaded['Inventory'][0]['Count'] = NBTTagInt(2)
+    assert loaded.digest() != digest and tag.digest() == digest
+
+
+def test_copied_children_do_not_invalidate_the_original():
+    tag = _sample()
+    digest = tag.digest()
+    duplicate = copy.copy(tag['Inventory'])
+    duplicate.append(NBTTagCompound())
+    assert tag._digest_cache == digest
+
+
+def test_compound_order_does_not_change_digest():
+    forward = NBTTagCompound({'a': NBTTagInt(1), 'b': NBTTagString('x')})
+    backward = NBTTagCompound({'b': NBTTagString('x'), 'a': NBTTagInt(1)})
+    assert forward.digest() == backward.digest()
+    assert forward.canonical_bytes() == backward.canonical_bytes()
+    assert forward.same_content(backward)
+    assert NBTTagCompound({'a': NBTTagInt(1)}).digest() != NBTTagCompound({'a': NBTTagLong(1)}).digest()
+
+
+def test_empty_list_matches_typed_empty_list():
+    typed = NBTBase.read_new_tag(io.BytesIO(b'\x09\x00\x00\x03' + pack('!i', 0)))
+    assert typed.digest() == NBTTagList().digest()
+    assert typed.canonical_bytes() == NBTTagList().canonical_bytes()
+    assert NBTTagList().digest() != NBTTagIntArray().digest()
+
+
+def test_nested_change_invalidates_ancestors_only():
+    tag = _sample()
+    digest = tag.digest()
+    name = tag['name']._digest_cache
+    ints = tag['ints']._digest_cache
+    tag['Inventory'][0]['Count'] = NBTTagInt(2)
+    assert tag._digest_cache is None and tag['Inventory']._digest_cache is None
+    assert tag['ints']._digest_cache == ints and tag['name']._digest_cache == name
+    assert tag.digest() != digest
+    tag['Inventory'][0]['Count'] = NBTTagInt(1)
+    assert tag.digest() == digest
+
+
+def test_shared_child_invalidates_every_parent():
+    shared = NBTTagList([NBTTagInt(1)])
+    first = NBTTagCompound({'list': shared})
+    second = NBTTagCompound({'wrapped': NBTTagCompound({'list': shared})})
+    digests = (first.digest(), second.digest())
+    shared.append(NBTTagInt(2))
+    assert first.digest() != digests[0] and second.digest() != digests[1]
+    assert first.digest() == NBTTagCompound({'list': NBTTagList([NBTTagInt(1), NBTTagInt(2)])}).digest()
+
+
+def test_dead_parents_are_skipped():
+    child = NBTTagList([NBTTagInt(1)])
+    NBTTagCompound({'child': child}).digest()
+    gc.collect()
+    child.append(NBTTagInt(2))
+    parent = NBTTagCompound({'child': child})
+    parent.digest()
+    assert len(child._parents) == 1
+
+
+def _replace_slice(tag):
+    tag['Inventory'][0:1] = [NBTTagCompound({'Count': NBTTagInt(3)})]
+
+
+def _sort(tag):
+    tag['ints'].sort(reverse=True)
+
+
+def _list_iadd(tag):
+    inventory = tag['Inventory']
+    inventory += [NBTTagCompound()]
+
+
+def _compound_ior(tag):
+    inventory = tag['Inventory'][0]
+    inventory |= {'Slot': NBTTagInt(0)}
+
+
+def _setdefault(tag):
+    tag['Inventory'][0].setdefault('Slot', NBTTagInt(0))
+
+
+def _bytes_iadd(tag):
+    data = tag['bytes']
+    data += b'\x03'
+
+
+def _bytes_extend(tag):
+    tag['bytes'].extend(b'\x03')
+
+
+def _bytes_slice(tag):
+    tag['bytes'][0:1] = b'\x07\x08'
+
+
+def _ints_delete(tag):
+    del tag['ints'][0]
+
+
+def _pop(tag):
+    tag['Inventory'][0].pop('Count')
+
+
+@pytest.mark.parametrize('mutate', [_replace_slice, _sort, _list_iadd, _compound_ior, _setdefault, _bytes_iadd,
+                                    _bytes_extend, _bytes_slice, _ints_delete, _pop])
+def test_mutators_invalidate(mutate):
+    tag = _sample()
+    digest = tag.digest()
+    mutate(tag)
+    assert tag._digest_cache is None
+    assert tag.digest() != digest
+    assert tag.digest() == copy.deepcopy(tag).digest() == NBTBase.read_new_tag(io.BytesIO(_encode(tag))).digest()
+
+
+def test_memoryview_write_needs_explicit_invalidation():
+    tag = _sample()
+    digest = tag.digest()
+    memoryview(tag['bytes'])[0] = 9
+    assert tag.digest() == digest
+    tag['bytes'].invalidate_digest()
+    assert tag.digest() != digest
+    assert tag.digest() == NBTBase.read_new_tag(io.BytesIO(_encode(tag))).digest()
+
+
+def test_mapped_views_match_tags(tmp_path):
+    location = str(tmp_path / 'sample.nbt')
+    tag = _sample()
+    tag['longs'] = NBTTagLongArray([-(2 ** 63), 5])
+    nbt.write(tag, location)
+    mapped = nbt.read_mapped(location)
+    assert isinstance(mapped['bytes'], NBTTagByteArrayView) and isinstance(mapped['ints'], NBTTagIntArrayView)
+    assert mapped.digest() == tag.digest()
+    for key in ('bytes', 'ints', 'longs'):
+        assert mapped[key].digest() == tag[key].digest()
+        assert mapped[key].canonical_bytes() == tag[key].canonical_bytes()
@@ -0,0 +1,76 @@
+import json
+import math
+
+import pytest
+
+from nbt import NBTTagByte, NBTTagByteArray, NBTTagCompound, NBTTagDouble, NBTTagFloat, NBTTagInt, \
+    NBTTagList, NBTTagLongArray, NBTTagString, from_json, to_json
+
+
+def _sample() -> NBTTagCompound:
+    return NBTTagCompound({
+        'name': NBTTagString('Steve'),
+        'flag': NBTTagByte(-1),
+        'light': NBTTagByteArray([0, 127, 128, 255]),
+        'states': NBTTagLongArray([-2 ** 63, 2 ** 63 - 1]),
+        'pos': NBTTagList([NBTTagDouble(1.5), NBTTagDouble(-0.25)])
+    })
+
+
+def test_typed_round_trip():
+    tag = _sample()
+    assert from_json(to_json(tag)) == tag
+
+
+def test_typed_non_finite_floats_are_valid_json():
+    tag = NBTTagList([NBTTagFloat(float('nan')), NBTTagFloat(float('inf')), NBTTagFloat(float('-inf'))])
+    text = to_json(tag)
+    values = [element['value'] for element in json.loads(text, parse_constant=pytest.fail)['value']]
+    assert values == ['NaN', 'Infinity', '-Infinity']
+    decoded = from_json(text)
+    assert math.isnan(decoded[0]) and decoded[1] == float('inf') and decoded[2] == float('-inf')
+
+
+def test_plain_non_finite_float_raises():
+    with pytest.raises(RuntimeError):
+        to_json(NBTTagCompound({'x': NBTTagDouble(float('nan'))}), typed=False)
+
+
+@pytest.mark.parametrize('value', [
+    {'type': 'string', 'value': 5},
+    {'type': 'int', 'value': '5'},
+    {'type': 'int', 'value': 1.5},
+    {'type': 'byte', 'value': True},
+    {'type': 'byte', 'value': 128},
+    {'type': 'long', 'value': 2 ** 63},
+    {'type': 'double', 'value': 'NaNx'},
+    {'type': 'double', 'value': False},
+    {'type': 'byte_array', 'value': [256]},
+    {'type': 'int_array', 'value': 'abc'},
+    {'type': 'long_array', 'value': [1.0]},
+])
+def test_typed_value_must_match_declared_type(value):
+    with pytest.raises(RuntimeError):
+        from_json(json.dumps(value))
+
+
+def test_plain_values_keep_inferred_types():
+    tag = from_json('{"on": true, "count": 3, "ratio": 0.5, "name": "x"}', typed=False)
+    assert tag == NBTTagCompound({'on': NBTTagByte(1), 'count': NBTTagInt(3), 'ratio': NBTTagDouble(0.5),
+                                  'name': NBTTagString('x')})
+
+
+def test_plain_schema_mismatch_raises():
+    with pytest.raises(RuntimeError):
+        from_json('{"name": 5}', typed=False, schema={'name': 'string'})
+
+
+@pytest.mark.parametrize('typed', [True, False])
+def test_lone_surrogates_are_escaped(tmp_path, typed):
+    tag = NBTTagCompound({'a\udc00': NBTTagString('a\ud800'), 'text': NBTTagString('é€😀')})
+    location = tmp_path / 'sample.json'
+    with open(location, 'w', encoding='utf-8') as stream:
+        to_json(tag, stream, typed=typed)
+    text = location.read_text(encoding='utf-8')
+    assert '\\ud800' in text and '\\udc00' in text and 'é€😀' in text
+    assert from_json(text, typed=typed) == tag
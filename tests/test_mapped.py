@@ -0,0 +1,92 @@
+import gc
+import io
+import os
+
+import nbt
+from nbt import NBTBase, NBTTagByteArray, NBTTagCompound, NBTTagInt, NBTTagIntArray, NBTTagLongArray
+
+
+def _sample() -> NBTTagCompound:
+    return NBTTagCompound({
+        'bytes': NBTTagByteArray(range(16)),
+        'ints': NBTTagIntArray([1, -2, 3, 2 ** 31 - 1]),
+        'longs': NBTTagLongArray([-(2 ** 63), 5]),
+        'n': NBTTagInt(1)
+    })
+
+
+def test_read_mapped_matches_read(tmp_path):
+    location = str(tmp_path / 'sample.nbt')
+    nbt.write(_sample(), location)
+    mapped = nbt.read_mapped(location)
+    assert mapped.same_content(nbt.read(location))
+    assert mapped['ints'][1] == -2
+    assert list(mapped['longs']) == [-(2 ** 63), 5]
+
+
+def test_write_back_to_mapped_file(tmp_path):
+    location = str(tmp_path / 'sample.nbt')
+    nbt.write(_sample(), location)
+    mapped = nbt.read_mapped(location)
+    mapped['n'] = NBTTagInt(2)
+    nbt.write(mapped, location)
+    nbt.write_zipped(mapped, location)
+
+    expected = _sample()
+    expected['n'] = NBTTagInt(2)
+    assert nbt.read_zipped(location).same_content(expected)
+    assert mapped.same_content(expected)
+    assert [path.name for path in tmp_path.iterdir()] == ['sample.nbt']
+
+
+def test_write_keeps_links_and_inode(tmp_path):
+    target = str(tmp_path / 'target.nbt')
+    nbt.write(_sample(), target)
+    os.link(target, str(tmp_path / 'hard.nbt'))
+    os.symlink(target, str(tmp_path / 'link.nbt'))
+    inode = os.stat(target).st_ino
+
+    expected = _sample()
+    expected['n'] = NBTTagInt(2)
+    nbt.write(expected, str(tmp_path / 'link.nbt'))
+    assert os.path.islink(str(tmp_path / 'link.nbt'))
+    assert os.stat(target).st_ino == inode
+    assert nbt.read(str(tmp_path / 'hard.nbt')).same_content(expected)
+
+
+def test_write_back_through_symlink_to_mapped_file(tmp_path):
+    target = str(tmp_path / 'target.nbt')
+    link = str(tmp_path / 'link.nbt')
+    nbt.write(_sample(), target)
+    os.symlink(target, link)
+    mapped = nbt.read_mapped(link)
+    mapped['n'] = NBTTagInt(2)
+    nbt.write(mapped, link)
+
+    assert os.path.islink(link)
+    assert nbt.read(target).same_content(mapped)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['link.nbt', 'target.nbt']
+
+
+def test_write_in_place_once_views_are_gone(tmp_path):
+    location = str(tmp_path / 'sample.nbt')
+    nbt.write(_sample(), location)
+    inode = os.stat(location).st_ino
+    mapped = nbt.read_mapped(location).copy()
+    gc.collect()
+    nbt.write(mapped, location)
+    assert os.stat(location).st_ino == inode
+
+
+def test_materialize_returns_a_copy(tmp_path):
+    location = str(tmp_path / 'sample.nbt')
+    nbt.write(_sample(), location)
+    view = nbt.read_mapped(location)['ints']
+    view.materialize()[0] = 99
+
+    stream = io.BytesIO()
+    NBTTagCompound({'ints': view}).write_out(stream)
+    stream.seek(0)
+    assert NBTBase.read_new_tag(stream)['ints'] == [1, -2, 3, 2 ** 31 - 1]
+    assert str(view) == "[I;1,-2,3,2147483647]"
+    assert view[0] == 1 and view[1:3] == [-2, 3]
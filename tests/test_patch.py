@@ -0,0 +1,75 @@
+import io
+
+import pytest
+
+import nbt
+from nbt import NBTBase, NBTTagByteArray, NBTTagCompound, NBTTagInt, NBTTagIntArray, NBTTagList, NBTTagLong, \
+    NBTTagString, patch, patch_file, value_at
+
+
+def _sample() -> NBTTagCompound:
+    section = NBTTagCompound({'Y': NBTTagInt(3), 'Light': NBTTagByteArray(range(8)),
+                              'States': NBTTagIntArray([1, 2, 3])})
+    return NBTTagCompound({
+        'DataVersion': NBTTagInt(2586),
+        'Level': NBTTagCompound({
+            'Status': NBTTagString('full'),
+            'LastUpdate': NBTTagLong(100),
+            'Sections': NBTTagList([section, section.copy()])
+        })
+    })
+
+
+def _encode(tag: NBTBase) -> bytearray:
+    stream = io.BytesIO()
+    tag.write_out(stream)
+    return bytearray(stream.getvalue())
+
+
+def _decode(buffer) -> NBTBase:
+    return NBTBase.read_new_tag(io.BytesIO(buffer))
+
+
+def test_fixed_width_patch_in_place():
+    buffer = _encode(_sample())
+    size = len(buffer)
+    assert patch(buffer, 'Level.LastUpdate', value_at(buffer, 'Level.LastUpdate') + 1) == 0
+    assert patch(buffer, 'Level.Sections.1.States.2', 9) == 0
+    assert len(buffer) == size
+
+    expected = _sample()
+    expected['Level']['LastUpdate'] = NBTTagLong(101)
+    expected['Level']['Sections'][1]['States'][2] = 9
+    assert _decode(buffer) == expected
+
+
+def test_variable_width_patch_splices():
+    buffer = _encode(_sample())
+    assert patch(buffer, 'Level.Status', 'generated') == 5
+    assert _decode(buffer)['Level']['Status'] == 'generated'
+
+
+def test_value_at_does_not_hold_the_buffer():
+    buffer = _encode(_sample())
+    section = value_at(buffer, 'Level.Sections.0')
+    patch(buffer, 'Level.Status', 'x')
+    buffer[:] = bytes(len(buffer))
+    assert section['Light'] == bytearray(range(8))
+    assert section['States'] == [1, 2, 3]
+
+
+def test_missing_paths():
+    buffer = _encode(_sample())
+    with pytest.raises(KeyError):
+        patch(buffer, 'Level.Missing', 1)
+    with pytest.raises(IndexError):
+        patch(buffer, 'Level.Sections.2.Y', 1)
+
+
+def test_patch_file(tmp_path):
+    location = str(tmp_path / 'level.nbt')
+    nbt.write(_sample(), location)
+    assert patch_file(location, 'DataVersion', 3000) == 0
+    assert patch_file(location, 'Level.Status', 'ok') == -2
+    tag = nbt.read(location)
+    assert tag['DataVersion'] == 3000 and tag['Level']['Status'] == 'ok'
@@ -0,0 +1,114 @@
+import io
+import struct
+import zlib
+from typing import Dict, Tuple
+
+import pytest
+
+import nbt
+from nbt import NBTBase, NBTTagCompound, NBTTagInt, NBTTagList, NBTTagLong, NBTTagString, RegionFile, RegionIndex
+from nbt.region.region import COMPRESSION_ZLIB, SECTOR_SIZE
+
+
+def _chunk(x: int, z: int, status: str = 'full', inhabited: int = 0) -> NBTTagCompound:
+    return NBTTagCompound({
+        'Level': NBTTagCompound({
+            'xPos': NBTTagInt(x),
+            'zPos': NBTTagInt(z),
+            'Status': NBTTagString(status),
+            'InhabitedTime': NBTTagLong(inhabited),
+            'Biomes': NBTTagList([NBTTagInt(1), NBTTagInt(2)])
+        })
+    })
+
+
+def _write_region(location: str, chunks: Dict[Tuple[int, int], Tuple[NBTBase, int]]) -> None:
+    locations = [0] * 1024
+    timestamps = [0] * 1024
+    sectors = []
+    for ((x, z), (tag, timestamp)) in chunks.items():
+        stream = io.BytesIO()
+        tag.write_out(stream)
+        data = zlib.compress(stream.getvalue())
+        sector = struct.pack('!iB', len(data) + 1, COMPRESSION_ZLIB) + data
+        sector += bytes(-len(sector) % SECTOR_SIZE)
+        locations[x + z * 32] = (2 + sum(len(s) for s in sectors) // SECTOR_SIZE) << 8 | len(sector) // SECTOR_SIZE
+        timestamps[x + z * 32] = timestamp
+        sectors.append(sector)
+    with open(location, 'wb') as stream:
+        stream.write(struct.pack('!1024I', *locations))
+        stream.write(struct.pack('!1024i', *timestamps))
+        stream.write(b''.join(sectors))
+
+
+FIELDS = {'status': 'Level.Status', 'inhabited': 'Level.InhabitedTime'}
+
+
+@pytest.fixture
+def region(tmp_path) -> str:
+    location = str(tmp_path / 'r.0.0.mca')
+    _write_region(location, {(0, 0): (_chunk(0, 0), 100), (1, 0): (_chunk(1, 0, 'empty', 5), 200),
+                             (3, 2): (_chunk(3, 2), 300)})
+    return location
+
+
+def test_region_file(region):
+    file = RegionFile(region)
+    assert list(file.chunks()) == [(0, 0), (1, 0), (3, 2)]
+    assert file.has_chunk(3, 2) and not file.has_chunk(2, 3)
+    assert file.timestamp(1, 0) == 200
+    assert file.read_chunk(3, 2).same_content(_chunk(3, 2))
+    assert file.read_chunk(5, 5) is None
+
+
+def test_update_rereads_only_changed_chunks(region):
+    index = RegionIndex(region, FIELDS)
+    assert index.update() == 3
+    assert index.update() == 0
+    assert RegionIndex(region, FIELDS).update() == 0
+
+    _write_region(region, {(0, 0): (_chunk(0, 0), 100), (1, 0): (_chunk(1, 0, 'full', 9), 250)})
+    index = RegionIndex(region, FIELDS)
+    assert index.update() == 1
+    assert index.chunks() == [(0, 0), (1, 0)]
+    assert index.values(1, 0) == {'status': ['full'], 'inhabited': [9]}
+
+
+def test_queries(region):
+    index = RegionIndex(region, FIELDS)
+    index.update()
+    assert index.find('status', 'full') == [(0, 0), (3, 2)]
+    assert index.modified_after(150) == [(1, 0), (3, 2)]
+    assert index.query(lambda values: values['inhabited'] == [5]) == [(1, 0)]
+    assert index.timestamp(32, 0) == 100
+    with pytest.raises(KeyError):
+        index.find('missing', 1)
+
+
+def test_changed_fields_invalidate_sidecar(region):
+    RegionIndex(region, FIELDS).update()
+    index = RegionIndex(region, {'status': 'Level.Status'})
+    assert index.chunks() == []
+    assert index.update() == 3
+    assert RegionIndex(region, {'status': 'Level.Status'}).chunks() == [(0, 0), (1, 0), (3, 2)]
+
+
+def test_mixed_types_survive_a_reload(region):
+    fields = {'level': 'Level.*'}
+    RegionIndex(region, fields).update()
+    values = RegionIndex(region, fields).values(0, 0)['level']
+    assert [type(tag) for tag in values] == [NBTTagInt, NBTTagInt, NBTTagString, NBTTagLong, NBTTagList]
+    assert values[2] == 'full'
+
+
+@pytest.mark.parametrize('sidecar', [b'', b'not gzip', None])
+def test_unreadable_sidecar_is_rebuilt(region, sidecar):
+    if sidecar is None:
+        nbt.write_zipped(NBTTagCompound({'Version': NBTTagInt(2), 'Fields': NBTTagString('x'),
+                                         'Chunks': NBTTagList([NBTTagInt(1)])}), region + '.idx')
+        sidecar = open(region + '.idx', 'rb').read()[:-6]
+    with open(region + '.idx', 'wb') as stream:
+        stream.write(sidecar)
+    index = RegionIndex(region, FIELDS)
+    assert index.update() == 3
+    assert RegionIndex(region, FIELDS).chunks() == [(0, 0), (1, 0), (3, 2)]
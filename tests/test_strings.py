@@ -0,0 +1,25 @@
+import io
+
+import pytest
+
+from nbt import NBTBase, NBTTagCompound, NBTTagString
+
+
+def _round_trip(tag: NBTBase) -> NBTBase:
+    stream = io.BytesIO()
+    tag.write_out(stream)
+    stream.seek(0)
+    return NBTBase.read_new_tag(stream)
+
+
+@pytest.mark.parametrize("value", ["", "plain", "café", "日本", "nul\0byte", "\U0001f525",
+                                   "a\ud800b", "\udc00", "\ud83d\ud800"])
+def test_string_round_trip(value):
+    tag = NBTTagCompound({value: NBTTagString(value)})
+    assert _round_trip(tag) == tag
+
+
+def test_malformed_string_raises_runtime_error():
+    stream = io.BytesIO(b'\x08\x00\x00\x00\x02\xc3\x28')
+    with pytest.raises(RuntimeError):
+        NBTBase.read_new_tag(stream)